@@ -1,100 +1,156 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import Annotated
+from typing_extensions import TypedDict
 from datetime import time
 
-
-class SessionPydantic(BaseModel):
-    email: str
-    password: str
-
-class SessionDeletePydantic(BaseModel):
-    sessionID: str
-
-class CourseCreate(BaseModel):
+# Constrained field types; limits mirror the column sizes in tables/ so bad
+# payloads are rejected by pydantic-core before they reach the database.
+ShortStr = Annotated[str, Field(min_length=1, max_length=255)]
+Email = Annotated[str, Field(min_length=3, max_length=255)]
+CourseCode = Annotated[str, Field(min_length=1, max_length=10)]
+CourseName = Annotated[str, Field(min_length=1, max_length=255)]
+Semester = Annotated[str, Field(min_length=1, max_length=20)]
+Department = Annotated[str, Field(min_length=1, max_length=50)]
+Instructor = Annotated[str, Field(max_length=100)]
+DaysOfWeek = Annotated[str, Field(max_length=10)]
+Location = Annotated[str, Field(max_length=100)]
+Prerequisites = Annotated[str, Field(max_length=255)]
+Credits = Annotated[int, Field(ge=0)]
+Capacity = Annotated[int, Field(ge=0)]
+ReviewScore = Annotated[int, Field(ge=1, le=5)]
+WorkloadHours = Annotated[int, Field(ge=0, le=168)]  # hours per week; column is SMALLINT
+Comment = Annotated[str, Field(max_length=2000)]
+CreditCap = Annotated[int, Field(ge=1, le=30)]  # credits per term a plan may schedule
+TermCount = Annotated[int, Field(ge=1, le=36)]
+HoldMinutes = Annotated[int, Field(ge=1, le=1440)]
+
+
+class RequestModel(BaseModel):
+    # request bodies are read-only once parsed; unknown keys are rejected rather than collected
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+
+class SessionPydantic(RequestModel):
+    email: Email
+    password: ShortStr
+
+class SessionDeletePydantic(RequestModel):
+    model_config = ConfigDict(defer_build=True)
+
+    sessionID: ShortStr
+
+class CourseCreate(RequestModel):
+    course_code: CourseCode
+    name: CourseName
+    description: str | None = None
+    credits: Credits
+    semester: Semester
+    department: Department
+    prerequisites: Prerequisites | None = None
+    capacity: Capacity | None = None
+    instructor: Instructor | None = None
+    days_of_week: DaysOfWeek | None = None
+    start_time: time | None = None
+    end_time: time | None = None
+    location: Location | None = None
+
+class CourseUpdate(RequestModel):
+    name: CourseName | None = None
+    description: str | None = None
+    credits: Credits | None = None
+    semester: Semester | None = None
+    department: Department | None = None
+    prerequisites: Prerequisites | None = None
+    capacity: Capacity | None = None
+    instructor: Instructor | None = None
+    days_of_week: DaysOfWeek | None = None
+    start_time: time | None = None
+    end_time: time | None = None
+    location: Location | None = None
+
+
+class CourseReviewCreate(RequestModel):
+    course_id: int | None = None
+    course_code: CourseCode | None = None
+    semester: Semester | None = None
+    user_identifier: ShortStr | None = None
+    user_name: ShortStr | None = None
+    rating: ReviewScore
+    difficulty: ReviewScore | None = None
+    workload_hours: WorkloadHours | None = None
+    would_recommend: bool | None = None
+    comment: Comment | None = None
+
+
+class CourseReviewUpdate(RequestModel):
+    rating: ReviewScore | None = None
+    difficulty: ReviewScore | None = None
+    workload_hours: WorkloadHours | None = None
+    would_recommend: bool | None = None
+    comment: Comment | None = None
+
+class CourseDelete(RequestModel):
+    model_config = ConfigDict(defer_build=True)
+
+    course_code: CourseCode
+    semester: Semester
+
+class updateUser(RequestModel):
+    name: ShortStr
+    sessionID: ShortStr
+    email: Email
+    phone: ShortStr
+    newPassword: ShortStr
+    major: ShortStr
+    degree: ShortStr
+
+class UserPydantic(RequestModel):
+     name: ShortStr
+     email: Email
+     phone: ShortStr
+     password: ShortStr
+     major: ShortStr
+     degree: ShortStr
+
+class UserDeletePydantic(RequestModel):
+    model_config = ConfigDict(defer_build=True)
+
+    sessionID: ShortStr
+    password: ShortStr
+
+class UserCoursePydantic(RequestModel):
+    model_config = ConfigDict(defer_build=True)
+
+    name: CourseName
+    semester: Semester
+    cid: CourseCode
+
+class SubsemesterPydantic(RequestModel):
+    model_config = ConfigDict(defer_build=True)
+
+    semester: Semester | None = None
+
+class DefaultSemesterSetPydantic(RequestModel):
+    model_config = ConfigDict(defer_build=True)
+
+    default: Semester
+
+
+class CourseOut(TypedDict):
+    id: int
     course_code: str
     name: str
-    description: Optional[str] = None
+    description: str | None
     credits: int
     semester: str
     department: str
-    prerequisites: Optional[str] = None
-    capacity: Optional[int] = None
-    instructor: Optional[str] = None
-    days_of_week: Optional[str] = None
-    start_time: Optional[time] = None
-    end_time: Optional[time] = None
-    location: Optional[str] = None
-
-class CourseUpdate(BaseModel):
-    name: Optional[str] = None
-    description: Optional[str] = None
-    credits: Optional[int] = None
-    semester: Optional[str] = None
-    department: Optional[str] = None
-    prerequisites: Optional[str] = None
-    capacity: Optional[int] = None
-    instructor: Optional[str] = None
-    days_of_week: Optional[str] = None
-    start_time: Optional[time] = None
-    end_time: Optional[time] = None
-    location: Optional[str] = None
-
-
-class CourseReviewCreate(BaseModel):
-    course_id: Optional[int] = None
-    course_code: Optional[str] = None
-    semester: Optional[str] = None
-    user_identifier: Optional[str] = None
-    user_name: Optional[str] = None
-    rating: int = Field(..., ge=1, le=5)
-    difficulty: Optional[int] = Field(None, ge=1, le=5)
-    workload_hours: Optional[int] = Field(None, ge=0)
-    would_recommend: Optional[bool] = None
-    comment: Optional[str] = Field(None, max_length=2000)
-
-
-class CourseReviewUpdate(BaseModel):
-    rating: Optional[int] = Field(None, ge=1, le=5)
-    difficulty: Optional[int] = Field(None, ge=1, le=5)
-    workload_hours: Optional[int] = Field(None, ge=0)
-    would_recommend: Optional[bool] = None
-    comment: Optional[str] = Field(None, max_length=2000)
-
-class CourseDelete(BaseModel):
-    course_code: str
-    semester: str
-
-class updateUser(BaseModel):
-    name:str
-    sessionID:str
-    email:str
-    phone:str
-    newPassword:str
-    major:str
-    degree:str
-
-class UserPydantic(BaseModel):
-     name: str
-     email: str
-     phone: str
-     password: str
-     major: str
-     degree: str
-
-class UserDeletePydantic(BaseModel):
-    sessionID: str
-    password: str
-
-class UserCoursePydantic(BaseModel):
-    name: str
-    semester: str
-    cid: str
-
-class SubsemesterPydantic(BaseModel):
-    semester: Optional[str] = None
-
-class DefaultSemesterSetPydantic(BaseModel):
-    default: str
-
-
-    
+    prerequisites: str | None
+    capacity: int | None
+    instructor: str | None
+    days_of_week: str | None
+    start_time: time | None
+    end_time: time | None
+    location: str | None
+
+# built at import so list responses use a warm serializer instead of one assembled on first request
+COURSE_LIST_ADAPTER = TypeAdapter(list[CourseOut])
@@ -1,18 +1,21 @@
+import importlib
+
+# needed for auth on every request; everything else is imported on first attribute access
 from . import user_controller
 from . import session_controller
-from . import course_controller
-from . import semester_controller
-from . import pathway_controller
-from . import optimizer_controller
-from . import four_year_controller
-from . import preferences_controller
-from . import reservations_controller
-from . import review_controller
 
 __all__ = [
 	'user_controller', 'session_controller', 'course_controller',
 	'semester_controller', 'pathway_controller', 'optimizer_controller',
 	'four_year_controller', 'preferences_controller', 'reservations_controller',
-    'review_controller'
+	'review_controller', 'professor_controller',
 ]
 
+
+def __getattr__(name):
+	# PEP 562 hook: import the controller submodule lazily and cache it on the package
+	if name in __all__:
+		module = importlib.import_module(f".{name}", __name__)
+		globals()[name] = module
+		return module
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
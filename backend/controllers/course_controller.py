@@ -1,13 +1,83 @@
 from typing import List, Dict, Optional
+import functools
+import threading
+from cachetools import LRUCache, TTLCache
+from cachetools.keys import hashkey
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from ..tables.course import Course
+from sqlalchemy.orm import Session, selectinload, aliased, raiseload
+from ..api_models import COURSE_LIST_ADAPTER
+from ..services import cache
+from ..tables.course import Course, DAY_BITS, days_to_mask, course_code_to_level
 from ..tables.course_corequisite import CourseCorequisite
 from sqlalchemy.exc import IntegrityError
 from ..tables.course_prerequisite import CoursePrerequisite
-from sqlalchemy import or_, and_, func
+from sqlalchemy import or_, and_, func, select, exists, update, false, inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import datetime
 
+#built once at import; filters are layered on with .where() per call.
+#raiseload("*") turns any relationship access that was not eager-loaded into an error
+#instead of a silent per-row lazy query
+_BASE_COURSES = select(Course).options(raiseload("*"))
+
+#same keys as Course.to_dict(); listing reads select these columns so rows skip ORM hydration
+_COURSE_COLUMNS = (
+    Course.id, Course.course_code, Course.name, Course.description, Course.credits,
+    Course.semester, Course.department, Course.prerequisites, Course.capacity,
+    Course.instructor, Course.days_of_week, Course.start_time, Course.end_time,
+    Course.location,
+)
+_COURSE_FIELDS = frozenset(Course.__table__.columns.keys())
+
+#distinct semesters change only when courses are written; cleared by _invalidate_course_caches(),
+#which services.cache runs after any commit that writes a Course
+_semester_cache: Optional[List[str]] = None
+
+#filtered listings (search, departments, instructors, levels) repeat across a browsing session;
+#keyed on the call arguments, cleared on course writes, and capped at 60s for other workers' writes
+#(commit events only reach this process)
+_listing_cache = TTLCache(maxsize=512, ttl=60)
+_listing_lock = threading.Lock()
+
+#check_course_conflict results for clashing pairs, keyed (lower id, higher id) and shared across
+#requests; hot pairs stay, cold ones are evicted; cleared with the other caches on course writes
+_conflict_cache = LRUCache(maxsize=4096)
+_conflict_lock = threading.Lock()
+
+def _invalidate_course_caches() -> None:
+    global _semester_cache
+    _semester_cache = None
+    with _listing_lock:
+        _listing_cache.clear()
+    with _conflict_lock:
+        _conflict_cache.clear()
+
+cache.register(_invalidate_course_caches, Course)
+
+def _cached_listing(fn):
+    """cache successful results of a listing function by its non-db arguments"""
+    @functools.wraps(fn)
+    def wrapper(db: Session, *args, **kwargs):
+        key = hashkey(fn.__name__, *args, **kwargs)
+        with _listing_lock:
+            cached = _listing_cache.get(key)
+        if cached is not None:
+            return cached
+        result = fn(db, *args, **kwargs)
+        if result.get("success"):
+            with _listing_lock:
+                _listing_cache[key] = result
+        return result
+    return wrapper
+
+def _course_rows(stmt, db: Session) -> List[Dict]:
+    """
+    run a select(*_COURSE_COLUMNS) statement and return JSON-ready dicts shaped like to_dict()
+    rows stream in batches as plain mappings, so no Course instances are built
+    """
+    rows = db.execute(stmt.execution_options(yield_per=500)).mappings()
+    return COURSE_LIST_ADAPTER.dump_python([dict(row) for row in rows], mode="json")
+
 def create_course(course_data: Dict, db: Session) -> Dict:
     """
     Create a new course.
@@ -20,19 +90,14 @@ def create_course(course_data: Dict, db: Session) -> Dict:
         Dict: Response with success status and course data or error message
     """
     try:
-        # Check if course already exists
-        existing = db.query(Course).filter(
-            Course.course_code == course_data["course_code"],
-            Course.semester == course_data["semester"]
-        ).first()
-        
-        if existing:
-            return {"success": False, "error": "Course already exists for this semester"}
-        
-        # Create new course
+        # Create new course; the unique (course_code, semester) index rejects duplicates
         new_course = Course(**course_data)
         db.add(new_course)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return {"success": False, "error": "Course already exists for this semester"}
         db.refresh(new_course)
         
         return {
@@ -44,6 +109,42 @@ def create_course(course_data: Dict, db: Session) -> Dict:
         db.rollback()
         return {"success": False, "error": str(e)}
 
+def create_courses_bulk(courses_data: List[Dict], db: Session, batch_size: int = 1000) -> Dict:
+    """
+    insert many courses in one transaction, for catalog imports
+    rows already present for their (course_code, semester) are skipped by the unique index
+    """
+    rows = []
+    for data in courses_data:
+        #a multi-row VALUES needs the same keys in every row; missing fields insert NULL
+        row = {k: data.get(k) for k in _COURSE_FIELDS if k not in ("id", "level", "days_mask")}
+        #core inserts bypass the @validates hooks, so derive their columns here
+        row["level"] = course_code_to_level(row.get("course_code"))
+        row["days_mask"] = days_to_mask(row.get("days_of_week"))
+        rows.append(row)
+
+    try:
+        added = 0
+        for start in range(0, len(rows), batch_size):
+            stmt = (
+                pg_insert(Course)
+                .values(rows[start:start + batch_size])
+                .on_conflict_do_nothing(index_elements=["course_code", "semester"])
+                .returning(Course.id)
+            )
+            added += len(db.execute(stmt).all())
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        return {"success": False, "error": str(e)}
+
+    return {
+        "success": True,
+        "message": f"Added {added} courses",
+        "added": added,
+        "skipped": len(rows) - added
+    }
+
 def get_courses(semester: Optional[str] = None, department: Optional[str] = None, db: Session = None) -> Dict:
     """
     Get all courses with optional filters.
@@ -57,17 +158,16 @@ def get_courses(semester: Optional[str] = None, department: Optional[str] = None
         Dict: Response with success status and list of courses
     """
     try:
-        query = db.query(Course)
+        stmt = select(*_COURSE_COLUMNS)
         
         if semester:
-            query = query.filter(Course.semester == semester)
+            stmt = stmt.where(Course.semester == semester)
         if department:
-            query = query.filter(Course.department == department)
+            stmt = stmt.where(Course.department == department)
             
-        courses = query.all()
         return {
             "success": True,
-            "courses": [course.to_dict() for course in courses]
+            "courses": _course_rows(stmt, db)
         }
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -85,10 +185,12 @@ def get_course(course_code: str, semester: str, db: Session) -> Dict:
         Dict: Response with success status and course data
     """
     try:
-        course = db.query(Course).filter(
-            Course.course_code == course_code,
-            Course.semester == semester
-        ).first()
+        course = db.execute(
+            _BASE_COURSES.where(
+                Course.course_code == course_code,
+                Course.semester == semester
+            )
+        ).scalars().first()
         
         if not course:
             return {"success": False, "error": "Course not found"}
@@ -111,25 +213,35 @@ def update_course(course_code: str, semester: str, updates: Dict, db: Session) -
         Dict: Response with success status and updated course data
     """
     try:
-        course = db.query(Course).filter(
-            Course.course_code == course_code,
-            Course.semester == semester
-        ).first()
+        match = (Course.course_code == course_code, Course.semester == semester)
+
+        # Update allowed fields in one UPDATE ... RETURNING instead of per-attribute setattr
+        values = {
+            key: value for key, value in updates.items()
+            if key in _COURSE_FIELDS and value is not None
+        }
+        if "days_of_week" in values:
+            #bulk UPDATE skips the model validator, so keep the day bitmask in step here
+            values["days_mask"] = days_to_mask(values["days_of_week"])
+        if "course_code" in values:
+            values["level"] = course_code_to_level(values["course_code"])
+        if values:
+            course = db.execute(
+                update(Course).where(*match).values(**values).returning(Course)
+            ).scalars().first()
+        else:
+            course = db.execute(_BASE_COURSES.where(*match)).scalars().first()
         
         if not course:
             return {"success": False, "error": "Course not found"}
-            
-        # Update allowed fields
-        for key, value in updates.items():
-            if hasattr(course, key) and value is not None:
-                setattr(course, key, value)
-                
+
+        # serialize from the RETURNING row before commit expires it
+        course_dict = course.to_dict()
         db.commit()
-        db.refresh(course)
         return {
             "success": True,
             "message": "Course updated successfully",
-            "course": course.to_dict()
+            "course": course_dict
         }
     except Exception as e:
         db.rollback()
@@ -148,10 +260,13 @@ def delete_course(course_code: str, semester: str, db: Session) -> Dict:
         Dict: Response with success status
     """
     try:
-        course = db.query(Course).filter(
-            Course.course_code == course_code,
-            Course.semester == semester
-        ).first()
+        #plain select: the session needs to load dependent rows (reviews, links) to cascade the delete
+        course = db.execute(
+            select(Course).where(
+                Course.course_code == course_code,
+                Course.semester == semester
+            )
+        ).scalars().first()
         
         if not course:
             return {"success": False, "error": "Course not found"}
@@ -165,171 +280,24 @@ def delete_course(course_code: str, semester: str, db: Session) -> Dict:
     except Exception as e:
         db.rollback()
         return {"success": False, "error": str(e)}
-    """
-    Get all courses or courses for a specific semester.
-    
-    Args:
-        semester (Optional[str]): Filter courses by semester
-    
-    Returns:
-        Dict: Response with success status and list of courses
-    """
-    try:
-        if semester:
-            filtered_courses = [c for c in courses if c.get('semester') == semester]
-            return {
-                "success": True,
-                "courses": filtered_courses,
-                "count": len(filtered_courses),
-                "semester": semester
-            }
-        
-        return {
-            "success": True,
-            "courses": courses,
-            "count": len(courses)
-        }
-        
-    except Exception as e:
-        return {"success": False, "error": f"Failed to get courses: {str(e)}"}
-
-def get_course_by_id(course_id: str, semester: str) -> Dict:
-    """
-    Get a specific course by ID and semester.
-    
-    Args:
-        course_id (str): Course ID
-        semester (str): Semester
-    
-    Returns:
-        Dict: Response with success status and course data
-    """
-    try:
-        course = next((c for c in courses if c['cid'] == course_id and c['semester'] == semester), None)
-        
-        if not course:
-            return {"success": False, "error": "Course not found"}
-        
-        return {
-            "success": True,
-            "course": course
-        }
-        
-    except Exception as e:
-        return {"success": False, "error": f"Failed to get course: {str(e)}"}
-
-def update_course(course_id: str, semester: str, update_data: Dict) -> Dict:
-    """
-    Update an existing course.
-    
-    Args:
-        course_id (str): Course ID
-        semester (str): Semester
-        update_data (Dict): Dictionary containing fields to update
-    
-    Returns:
-        Dict: Response with success status and updated course data
-    """
-    try:
-        course_index = next((i for i, c in enumerate(courses) if c['cid'] == course_id and c['semester'] == semester), None)
-        
-        if course_index is None:
-            return {"success": False, "error": "Course not found"}
-        
-        # Update course data
-        courses[course_index].update(update_data)
-        courses[course_index]['updated_at'] = datetime.now().isoformat()
-        
-        return {
-            "success": True,
-            "message": "Course updated successfully",
-            "course": courses[course_index]
-        }
-        
-    except Exception as e:
-        return {"success": False, "error": f"Failed to update course: {str(e)}"}
-
-def delete_course(course_data: Dict) -> Dict:
-    """
-    Delete a course from the system.
-    
-    Args:
-        course_data (Dict): Dictionary containing course identification
-                           Expected keys: name, cid (optional), semester
-    
-    Returns:
-        Dict: Response with success status and message
-    """
-    try:
-        # Validate required fields
-        if 'name' not in course_data or 'semester' not in course_data:
-            return {"success": False, "error": "Missing required fields: name and semester"}
-        
-        name = course_data['name']
-        semester = course_data['semester']
-        cid = course_data.get('cid')
-        
-        # Find and remove the course
-        course_to_remove = None
-        for i, course in enumerate(courses):
-            if (course['name'] == name and 
-                course['semester'] == semester and 
-                (cid is None or course['cid'] == cid)):
-                course_to_remove = i
-                break
-        
-        if course_to_remove is None:
-            return {"success": False, "error": "Course not found"}
-        
-        removed_course = courses.pop(course_to_remove)
-        
-        return {
-            "success": True,
-            "message": "Course deleted successfully",
-            "deleted_course": removed_course
-        }
-        
-    except Exception as e:
-        return {"success": False, "error": f"Failed to delete course: {str(e)}"}
 
-def delete_course_by_id(course_id: str, semester: str) -> Dict:
+def get_semesters(db: Session) -> Dict:
     """
-    Delete a course by ID and semester.
+    Get all unique semesters that have courses.
     
     Args:
-        course_id (str): Course ID
-        semester (str): Semester
-    
-    Returns:
-        Dict: Response with success status and message
-    """
-    try:
-        course_index = next((i for i, c in enumerate(courses) if c['cid'] == course_id and c['semester'] == semester), None)
-        
-        if course_index is None:
-            return {"success": False, "error": "Course not found"}
-        
-        removed_course = courses.pop(course_index)
-        
-        return {
-            "success": True,
-            "message": "Course deleted successfully",
-            "deleted_course": removed_course
-        }
-        
-    except Exception as e:
-        return {"success": False, "error": f"Failed to delete course: {str(e)}"}
-
-def get_semesters() -> Dict:
-    """
-    Get all unique semesters from courses.
+        db (Session): Database session
     
     Returns:
         Dict: Response with success status and list of semesters
     """
+    global _semester_cache
     try:
-        semesters = list(set(course.get('semester') for course in courses if course.get('semester')))
-        semesters.sort()
+        if _semester_cache is None:
+            _semester_cache = sorted(
+                db.execute(select(Course.semester).distinct()).scalars().all()
+            )
+        semesters = list(_semester_cache)
         
         return {
             "success": True,
@@ -340,175 +308,208 @@ def get_semesters() -> Dict:
     except Exception as e:
         return {"success": False, "error": f"Failed to get semesters: {str(e)}"}
 
-def clear_all_courses() -> Dict:
-    """
-    Clear all courses from the system (useful for testing).
-    
-    Returns:
-        Dict: Response with success status and message
-    """
-    global courses
-    courses_count = len(courses)
-    courses = []
-    
-    return {
-        "success": True,
-        "message": f"Cleared {courses_count} courses successfully"
-    }
-
 def get_course_with_prerequisites(course_id: int, db: Session):
     """get a course with all its prerequisites."""
-    course = db.query(Course).filter(Course.id == course_id).first()
+    #prerequisites are batch-loaded in one extra IN query instead of a per-course join
+    course = db.get(Course, course_id, options=[raiseload("*"), selectinload(Course.prerequisite_courses)])
+    if course is not None and "prerequisite_courses" in inspect(course).unloaded:
+        #identity-map hit: the instance came from an earlier query, so load the collection now
+        db.refresh(course, ["prerequisite_courses"])
     
     if not course:
         return None
     
-    #get all prerequisites
-    prerequisites = db.query(Course).join(
-        CoursePrerequisite,
-        CoursePrerequisite.prerequisite_id == Course.id
-    ).filter(
-        CoursePrerequisite.course_id == course_id
-    ).all()
-    
     return {
         "id": course.id,
         "course_code": course.course_code,
-        "title": course.title,
+        "title": course.name,
         "prerequisites": [
             {
                 "id": prereq.id,
                 "course_code": prereq.course_code,
-                "title": prereq.title
+                "title": prereq.name
             }
-            for prereq in prerequisites
+            for prereq in course.prerequisite_courses
         ]
     }
 
+def _course_ids_by_code(codes: List[str], db: Session) -> Dict[str, int]:
+    """map each course code to its id with a single IN query (lowest id wins across semesters)"""
+    rows = db.execute(
+        select(Course.id, Course.course_code)
+        .where(Course.course_code.in_(codes))
+        .order_by(Course.id)
+    ).all()
+    ids = {}
+    for course_id, code in rows:
+        ids.setdefault(code, course_id)
+    return ids
+
 def add_prerequisite(course_code: str, prerequisite_code: str, db: Session):
     """add a prerequisite to a course"""
-    #find both courses
-    course = db.query(Course).filter(Course.course_code == course_code).first()
-    prerequisite = db.query(Course).filter(Course.course_code == prerequisite_code).first()
+    #find both courses in one query
+    ids = _course_ids_by_code([course_code, prerequisite_code], db)
     
-    if not course or not prerequisite:
+    if course_code not in ids or prerequisite_code not in ids:
         raise ValueError("Course or prerequisite not found")
     
-    #create relationship (setup relationships in CoursePrerequisite table if want to use in future)
+    #create relationship; the (course_id, prerequisite_id) primary key rejects duplicates
     prereq_relation = CoursePrerequisite(
-        course_id=course.id,
-        prerequisite_id=prerequisite.id
+        course_id=ids[course_code],
+        prerequisite_id=ids[prerequisite_code]
     )
     
-    db.add(prereq_relation)
-    db.commit()
+    try:
+        db.add(prereq_relation)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return {"message": "Prerequisite already exists"}
     
     return {"message": f"Added {prerequisite_code} as prerequisite for {course_code}"}
 
 def get_courses_requiring_prerequisite(prerequisite_code: str, db: Session):
     """find all courses that require a specific prerequisite"""
-    prerequisite = db.query(Course).filter(
-        Course.course_code == prerequisite_code
-    ).first()
+    prerequisite = db.execute(
+        _BASE_COURSES.where(Course.course_code == prerequisite_code)
+    ).scalars().first()
     
     if not prerequisite:
         return []
     
-    courses = db.query(Course).join(
-        CoursePrerequisite,
-        CoursePrerequisite.course_id == Course.id
-    ).filter(
-        CoursePrerequisite.prerequisite_id == prerequisite.id
-    ).all()
+    courses = db.execute(
+        _BASE_COURSES.join(
+            CoursePrerequisite,
+            CoursePrerequisite.course_id == Course.id
+        ).where(
+            CoursePrerequisite.prerequisite_id == prerequisite.id
+        )
+    ).scalars().all()
     
     return courses
 
 def check_prerequisites_met(student_courses: list[str], target_course: str, db: Session):
     """check if student has completed all prerequisites for a course"""
-    course = db.query(Course).filter(Course.course_code == target_course).first()
+    course = db.execute(_BASE_COURSES.where(Course.course_code == target_course)).scalars().first()
     
     if not course:
         return False
     
-    #get required prerequisites
-    required_prereqs = db.query(Course.course_code).join(
-        CoursePrerequisite,
-        CoursePrerequisite.prerequisite_id == Course.id
-    ).filter(
-        CoursePrerequisite.course_id == course.id
-    ).all()
-    
-    required_codes = {prereq[0] for prereq in required_prereqs}
-    student_codes = set(student_courses)
-    
-    missing = required_codes - student_codes
+    #required prerequisites the student has not taken, filtered in the database
+    missing = db.execute(
+        select(Course.course_code).join(
+            CoursePrerequisite,
+            CoursePrerequisite.prerequisite_id == Course.id
+        ).where(
+            CoursePrerequisite.course_id == course.id,
+            Course.course_code.notin_(student_courses)
+        ).distinct()
+    ).scalars().all()
     
     return {
-        "can_enroll": len(missing) == 0,
+        "can_enroll": not missing,
         "missing_prerequisites": list(missing)
     }
 
 def get_course_with_corequisites(course_id: int, db: Session):
-    course = db.query(Course).filter(Course.id == course_id).first()
+    course = db.get(Course, course_id, options=[raiseload("*"), selectinload(Course.corequisite_courses)])
+    if course is not None and "corequisite_courses" in inspect(course).unloaded:
+        #identity-map hit: the instance came from an earlier query, so load the collection now
+        db.refresh(course, ["corequisite_courses"])
     if not course:
         return None
 
-    coreqs = (
-        db.query(Course)
-        .join(CourseCorequisite, CourseCorequisite.corequisite_id == Course.id)
-        .filter(CourseCorequisite.course_id == course_id)
-        .all()
-    )
-
     return {
         "id": course.id,
         "course_code": course.course_code,
-        "title": getattr(course, "title", None),
+        "title": course.name,
         "corequisites": [
             {
                 "id": c.id,
                 "course_code": c.course_code,
-                "title": getattr(c, "title", None),
+                "title": c.name,
             }
-            for c in coreqs
+            for c in course.corequisite_courses
         ],
     }
 
 def add_corequisite(course_code: str, corequisite_code: str, db: Session):
-    course = db.query(Course).filter(Course.course_code == course_code).first()
-    coreq = db.query(Course).filter(Course.course_code == corequisite_code).first()
+    ids = _course_ids_by_code([course_code, corequisite_code], db)
 
-    if not course or not coreq:
+    if course_code not in ids or corequisite_code not in ids:
         raise ValueError("Course or corequisite not found")
 
-    exists = (
-        db.query(CourseCorequisite)
-        .filter(
-            CourseCorequisite.course_id == course.id,
-            CourseCorequisite.corequisite_id == coreq.id,
-        )
-        .first()
-    )
-    if exists:
+    #the (course_id, corequisite_id) primary key doubles as the existence check
+    try:
+        db.add(CourseCorequisite(course_id=ids[course_code], corequisite_id=ids[corequisite_code]))
+        db.commit()
+    except IntegrityError:
+        db.rollback()
         return {"message": "Corequisite already exists"}
-
-    db.add(CourseCorequisite(course_id=course.id, corequisite_id=coreq.id))
-    db.commit()
     return {"message": f"Added {corequisite_code} as corequisite for {course_code}"}
 
 def get_courses_requiring_corequisite(corequisite_code: str, db: Session):
-    coreq = db.query(Course).filter(Course.course_code == corequisite_code).first()
+    coreq = db.execute(_BASE_COURSES.where(Course.course_code == corequisite_code)).scalars().first()
     if not coreq:
         return []
 
-    courses = (
-        db.query(Course)
+    courses = db.execute(
+        _BASE_COURSES
         .join(CourseCorequisite, CourseCorequisite.course_id == Course.id)
-        .filter(CourseCorequisite.corequisite_id == coreq.id)
-        .all()
-    )
+        .where(CourseCorequisite.corequisite_id == coreq.id)
+    ).scalars().all()
     return courses
 
+def _link_courses_bulk(link_model, other_column: str, pairs: List[tuple], db: Session) -> Dict:
+    """insert many (course_code, other_code) links with one lookup, one INSERT and one commit"""
+    ids = _course_ids_by_code(list({code for pair in pairs for code in pair}), db)
+    missing = sorted({code for pair in pairs for code in pair if code not in ids})
+
+    rows = [
+        {"course_id": course_id, other_column: other_id}
+        for course_id, other_id in {
+            (ids[course_code], ids[other_code])
+            for course_code, other_code in pairs
+            if course_code in ids and other_code in ids
+        }
+    ]
+    added = 0
+    if rows:
+        #existing links are skipped by the primary key instead of a pre-select
+        stmt = (
+            pg_insert(link_model)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["course_id", other_column])
+            .returning(link_model.course_id)
+        )
+        added = len(db.execute(stmt).all())
+        db.commit()
+
+    return {"added": added, "missing_courses": missing}
+
+def add_prerequisites_bulk(pairs: List[tuple], db: Session) -> Dict:
+    """add many (course_code, prerequisite_code) pairs at once, for catalog imports"""
+    result = _link_courses_bulk(CoursePrerequisite, "prerequisite_id", pairs, db)
+    result["message"] = f"Added {result['added']} prerequisite links"
+    return result
+
+def add_corequisites_bulk(pairs: List[tuple], db: Session) -> Dict:
+    """add many (course_code, corequisite_code) pairs at once, for catalog imports"""
+    result = _link_courses_bulk(CourseCorequisite, "corequisite_id", pairs, db)
+    result["message"] = f"Added {result['added']} corequisite links"
+    return result
+
+def _level_filter(level: str):
+    """
+    course level clause, e.g. "2000" -> Course.level == 2000
+    compares the indexed level column instead of pattern-matching course_code
+    """
+    #level is keyed by its first digit, same as course_code_to_level
+    if not level[0].isdigit():
+        return false()
+    return Course.level == int(level[0]) * 1000
+
+@_cached_listing
 def search_courses(
     db: Session,
     query: Optional[str] = None,
@@ -547,7 +548,9 @@ def search_courses(
     returns dict with success status, courses list, and other data
     """
     try:
-        base_query = db.query(Course)
+        #column projection: plain rows, no ORM instances to hydrate; the window count
+        #gives the pre-pagination total on every row so one round trip covers both
+        base_query = select(*_COURSE_COLUMNS, func.count().over().label("total_count"))
     
         #apply filters
         filters = []
@@ -586,10 +589,7 @@ def search_courses(
     
         #course level filter
         if level:
-            #get level from course code by taking first digit for the level
-            level_digit = level[0] if level else None
-            if level_digit:
-                filters.append(Course.course_code.ilike(f"%-{level_digit}___"))
+            filters.append(_level_filter(level))
     
         #capacity availability filter
         if has_capacity:
@@ -597,10 +597,7 @@ def search_courses(
     
         #apply filters
         if filters:
-            base_query = base_query.filter(and_(*filters))
-    
-        #get total count before pagination
-        total_count = base_query.count()
+            base_query = base_query.where(and_(*filters))
     
         #sorting
         sort_column = getattr(Course, sort_by, Course.course_code)
@@ -613,11 +610,21 @@ def search_courses(
         base_query = base_query.limit(limit).offset(offset)
     
         #execute query
-        courses = base_query.all()
+        rows = [dict(row) for row in db.execute(base_query.execution_options(yield_per=200)).mappings()]
+        if rows:
+            total_count = rows[0]["total_count"]
+            for row in rows:
+                del row["total_count"]
+        elif offset:
+            #page past the end carries no window value; count directly
+            total_count = db.execute(select(func.count(Course.id)).where(*filters)).scalar()
+        else:
+            total_count = 0
+        courses = COURSE_LIST_ADAPTER.dump_python(rows, mode="json")
     
         return {
             "success": True,
-            "courses": [course.to_dict() for course in courses],
+            "courses": courses,
             "metadata": {
                 "total": total_count,
                 "limit": limit,
@@ -631,6 +638,7 @@ def search_courses(
         return {"success": False, "error": str(e)}
 
 
+@_cached_listing
 def get_departments(db: Session, semester: Optional[str] = None) -> Dict:
     """
     gets list of depts
@@ -642,12 +650,12 @@ def get_departments(db: Session, semester: Optional[str] = None) -> Dict:
     returns dict with success status and list of depts
     """
     try:
-        query = db.query(Course.department).distinct()
+        query = select(Course.department).distinct()
     
         if semester:
-            query = query.filter(Course.semester == semester)
+            query = query.where(Course.semester == semester)
     
-        departments = [dept[0] for dept in query.all()]
+        departments = list(db.execute(query).scalars().all())
         departments.sort()
     
         return {
@@ -659,6 +667,7 @@ def get_departments(db: Session, semester: Optional[str] = None) -> Dict:
         return {"success": False, "error": str(e)}
 
 
+@_cached_listing
 def get_instructors(db: Session, semester: Optional[str] = None, department: Optional[str] = None) -> Dict:
     """
     get list of instructors
@@ -671,14 +680,14 @@ def get_instructors(db: Session, semester: Optional[str] = None, department: Opt
     returns dict with success status and instructors
     """
     try:
-        query = db.query(Course.instructor).distinct().filter(Course.instructor.isnot(None))
+        query = select(Course.instructor).distinct().where(Course.instructor.isnot(None))
     
         if semester:
-            query = query.filter(Course.semester == semester)
+            query = query.where(Course.semester == semester)
         if department:
-            query = query.filter(Course.department == department)
+            query = query.where(Course.department == department)
     
-        instructors = [instr[0] for instr in query.all()]
+        instructors = list(db.execute(query).scalars().all())
         instructors.sort()
     
         return {
@@ -690,6 +699,7 @@ def get_instructors(db: Session, semester: Optional[str] = None, department: Opt
         return {"success": False, "error": str(e)}
 
 
+@_cached_listing
 def get_course_levels(db: Session, department: Optional[str] = None) -> Dict:
     """
     get available course levels
@@ -701,23 +711,12 @@ def get_course_levels(db: Session, department: Optional[str] = None) -> Dict:
     returns dict with success status and list of levels
     """
     try:
-        query = db.query(Course.course_code)
+        query = select(Course.level).distinct().where(Course.level.isnot(None))
     
         if department:
-            query = query.filter(Course.department == department)
+            query = query.where(Course.department == department)
     
-        course_codes = [code[0] for code in query.all()]
-    
-        #get level from course code by taking first digit for the level
-        levels = set()
-        for code in course_codes:
-            if '-' in code:
-                number_part = code.split('-')[1]
-                if number_part and number_part[0].isdigit():
-                    level = number_part[0] + "000"
-                    levels.add(level)
-    
-        levels_list = sorted(list(levels))
+        levels_list = [str(level) for level in db.execute(query.order_by(Course.level)).scalars().all()]
     
         return {
             "success": True,
@@ -741,21 +740,18 @@ def get_courses_by_department_level(db: Session, department: str, level: str, se
     returns dict with success status and list of courses
     """
     try:
-        query = db.query(Course).filter(Course.department == department)
+        query = select(*_COURSE_COLUMNS).where(Course.department == department)
     
         if semester:
-            query = query.filter(Course.semester == semester)
+            query = query.where(Course.semester == semester)
     
         #filter by level
-        level_digit = level[0] if level else None
-        if level_digit:
-            query = query.filter(Course.course_code.ilike(f"%-{level_digit}___"))
-    
-        courses = query.order_by(Course.course_code).all()
+        if level:
+            query = query.where(_level_filter(level))
     
         return {
             "success": True,
-            "courses": [course.to_dict() for course in courses]
+            "courses": _course_rows(query.order_by(Course.course_code), db)
         }
 
     except Exception as e:
@@ -771,10 +767,8 @@ def has_day_overlap(days1: str, days2: str) -> bool:
     if not days1 or not days2:
         return False
     
-    #convert to sets and check intersection
-    set1 = set(days1.upper())
-    set2 = set(days2.upper())
-    return bool(set1 & set2)
+    #cached bitmask per day string; overlap is a single AND
+    return bool(days_to_mask(days1) & days_to_mask(days2))
 
 
 def has_time_overlap(start1, end1, start2, end2) -> bool:
@@ -786,22 +780,7 @@ def has_time_overlap(start1, end1, start2, end2) -> bool:
     if not all([start1, end1, start2, end2]):
         return False
 
-    #convert to datetime.time if needed
-    from datetime import time as dt_time
-    
-    def to_time(t):
-        if isinstance(t, dt_time):
-            return t
-        if isinstance(t, str):
-            parts = t.split(':')
-            return dt_time(int(parts[0]), int(parts[1]), int(parts[2]) if len(parts) > 2 else 0)
-        return t
-    
-    start1 = to_time(start1)
-    end1 = to_time(end1)
-    start2 = to_time(start2)
-    end2 = to_time(end2)
-    
+    #start_time/end_time are Time columns, so these are already datetime.time values
     #check if ranges overlap
     return start1 < end2 and start2 < end1
 
@@ -853,7 +832,8 @@ def check_course_conflict(course1: Course, course2: Course) -> Dict:
         }
     
     #both day and time overlap; conflict
-    overlapping_days = set(course1.days_of_week.upper()) & set(course2.days_of_week.upper())
+    shared = days_to_mask(course1.days_of_week) & days_to_mask(course2.days_of_week)
+    overlapping_days = {day for day, bit in DAY_BITS.items() if shared & bit}
     
     return {
         "has_conflict": True,
@@ -877,26 +857,68 @@ def check_course_conflict(course1: Course, course2: Course) -> Dict:
     }
 
 
+def _find_conflicting_pairs(course_ids: List[int], db: Session) -> List[tuple]:
+    """
+    id pairs among course_ids that meet on a shared day at overlapping times
+    one self-join in SQL instead of comparing every pair in python
+    """
+    c1 = aliased(Course)
+    c2 = aliased(Course)
+    stmt = (
+        select(c1.id, c2.id)
+        .join(c2, and_(
+            c1.semester == c2.semester,
+            c1.id < c2.id,
+            c1.start_time < c2.end_time,
+            c2.start_time < c1.end_time,
+            c1.days_mask.op('&')(c2.days_mask) != 0,
+        ))
+        .where(c1.id.in_(course_ids), c2.id.in_(course_ids))
+        .order_by(c1.id, c2.id)
+    )
+    return db.execute(stmt).tuples().all()
+
+
+def _pair_conflict(course1: Course, course2: Course) -> Dict:
+    """
+    check_course_conflict for a pair, memoized across requests
+    always computed with the lower id as course1, so (a, b) and (b, a) share one entry
+    """
+    if course2.id < course1.id:
+        course1, course2 = course2, course1
+    key = (course1.id, course2.id)
+    with _conflict_lock:
+        cached = _conflict_cache.get(key)
+    if cached is None:
+        cached = check_course_conflict(course1, course2)
+        with _conflict_lock:
+            _conflict_cache[key] = cached
+    return cached
+
+
+def _conflicts_for(courses: List[Course], db: Session) -> List[Dict]:
+    #details are only built for the pairs sql reports as conflicting
+    by_id = {c.id: c for c in courses}
+    return [
+        _pair_conflict(by_id[id1], by_id[id2])
+        for id1, id2 in _find_conflicting_pairs(list(by_id), db)
+    ]
+
+
 def check_schedule_conflicts(course_ids: List[int], db: Session) -> Dict:
     #check for conflicts from course ids
     try:
-        #get all courses
-        courses = db.query(Course).filter(Course.id.in_(course_ids)).all()
+        #get all courses; repeated ids count once
+        wanted = set(course_ids)
+        courses = db.execute(_BASE_COURSES.where(Course.id.in_(wanted))).scalars().all()
         
-        if len(courses) != len(course_ids):
+        if len(courses) != len(wanted):
             return {
                 "success": False,
                 "error": "One or more courses not found"
             }
         
-        conflicts = []
-        
-        #check each pair of courses
-        for i in range(len(courses)):
-            for j in range(i + 1, len(courses)):
-                result = check_course_conflict(courses[i], courses[j])
-                if result["has_conflict"]:
-                    conflicts.append(result)
+        conflicts = _conflicts_for(courses, db)
         
         return {
             "success": True,
@@ -913,28 +935,23 @@ def check_schedule_conflicts(course_ids: List[int], db: Session) -> Dict:
 def check_schedule_conflicts_by_codes(course_codes: List[str], semester: str, db: Session) -> Dict:
     #check for conflicts by course codes
     try:
-        #get all courses
-        courses = db.query(Course).filter(
-            Course.course_code.in_(course_codes),
-            Course.semester == semester
-        ).all()
+        #get all courses; repeated codes count once, and (course_code, semester) is unique
+        wanted = set(course_codes)
+        courses = db.execute(
+            _BASE_COURSES.where(
+                Course.course_code.in_(wanted),
+                Course.semester == semester
+            )
+        ).scalars().all()
         
-        if len(courses) != len(course_codes):
-            found_codes = {c.course_code for c in courses}
-            missing = set(course_codes) - found_codes
+        missing = wanted - {c.course_code for c in courses}
+        if missing:
             return {
                 "success": False,
-                "error": f"Courses not found: {', '.join(missing)}"
+                "error": f"Courses not found: {', '.join(sorted(missing))}"
             }
         
-        conflicts = []
-        
-        #check each pair of courses
-        for i in range(len(courses)):
-            for j in range(i + 1, len(courses)):
-                result = check_course_conflict(courses[i], courses[j])
-                if result["has_conflict"]:
-                    conflicts.append(result)
+        conflicts = _conflicts_for(courses, db)
         
         return {
             "success": True,
@@ -948,69 +965,107 @@ def check_schedule_conflicts_by_codes(course_codes: List[str], semester: str, db
         return {"success": False, "error": str(e)}
 
 
-def find_non_conflicting_courses(enrolled_course_ids: List[int], semester: str, db: Session, department: Optional[str] = None, level: Optional[str] = None) -> Dict:
+def find_non_conflicting_courses(enrolled_course_ids: List[int], semester: str, db: Session, department: Optional[str] = None, level: Optional[str] = None, include_reasons: bool = True, limit: Optional[int] = None, offset: int = 0) -> Dict:
     #find courses that dont conflict with currently enrolled courses
+    #include_reasons=False lists each conflicting course once without its clashing enrolled courses
+    #limit/offset page the non-conflicting list (ordered by id); without a limit every course is returned
     try:
-        #get enrolled courses
-        enrolled_courses = db.query(Course).filter(
-            Course.id.in_(enrolled_course_ids)
-        ).all()
+        #get enrolled courses; only echoed back, so read as plain rows
+        enrolled_courses = _course_rows(
+            select(*_COURSE_COLUMNS).where(Course.id.in_(enrolled_course_ids)),
+            db
+        )
         
-        #build query for available courses
-        query = db.query(Course).filter(Course.semester == semester)
+        #filters for available courses
+        filters = [Course.semester == semester]
         
         if department:
-            query = query.filter(Course.department == department)
+            filters.append(Course.department == department)
         
         if level:
-            level_digit = level[0] if level else None
-            if level_digit:
-                query = query.filter(Course.course_code.ilike(f"%-{level_digit}___"))
+            filters.append(_level_filter(level))
         
         #exclude already enrolled courses
         if enrolled_course_ids:
-            query = query.filter(~Course.id.in_(enrolled_course_ids))
+            filters.append(~Course.id.in_(enrolled_course_ids))
         
-        available_courses = query.all()
+        #an enrolled course meeting on a shared day at an overlapping time
+        enrolled = aliased(Course)
+        clashes = and_(
+            enrolled.id.in_(enrolled_course_ids),
+            enrolled.semester == Course.semester,
+            enrolled.days_mask.op('&')(Course.days_mask) != 0,
+            enrolled.start_time < Course.end_time,
+            Course.start_time < enrolled.end_time,
+        )
         
-        #check each available course for conflicts
-        non_conflicting = []
-        conflicting = []
+        #anti-join: the database returns only the courses with no clash
+        available = select(*_COURSE_COLUMNS).where(*filters, ~exists().where(clashes))
+        if limit is None:
+            non_conflicting = _course_rows(available, db)
+            non_conflicting_total = len(non_conflicting)
+        else:
+            #only the requested page is serialized; the window count carries the full total
+            rows = [dict(row) for row in db.execute(
+                available.add_columns(func.count().over().label("total_count"))
+                .order_by(Course.id).limit(limit).offset(offset)
+            ).mappings()]
+            if rows:
+                non_conflicting_total = rows[0]["total_count"]
+                for row in rows:
+                    del row["total_count"]
+            elif offset:
+                #page past the end carries no window value; count directly
+                non_conflicting_total = db.execute(
+                    select(func.count()).select_from(available.subquery())
+                ).scalar()
+            else:
+                non_conflicting_total = 0
+            non_conflicting = COURSE_LIST_ADAPTER.dump_python(rows, mode="json")
         
-        for course in available_courses:
-            has_conflict = False
-            conflict_with = []
-            
-            for enrolled in enrolled_courses:
-                result = check_course_conflict(enrolled, course)
-                if result["has_conflict"]:
-                    has_conflict = True
-                    conflict_with.append({
-                        "course_code": enrolled.course_code,
-                        "course_name": enrolled.name,
-                        "reason": result["reason"]
-                    })
-            
-            if has_conflict:
-                conflicting.append({
-                    "course": course.to_dict(),
-                    "conflicts_with": conflict_with
+        conflicting = []
+        if not include_reasons:
+            #semi-join: the database stops at the first clash per course
+            conflicting = [
+                {"course": row}
+                for row in _course_rows(
+                    select(*_COURSE_COLUMNS).where(*filters, exists().where(clashes)).order_by(Course.id),
+                    db
+                )
+            ]
+        else:
+            #clashing (course, enrolled) pairs; details are only built for these
+            by_course = {}
+            for course, clash in db.execute(
+                select(Course, enrolled).join(enrolled, clashes).where(*filters).order_by(Course.id, enrolled.id)
+                .execution_options(yield_per=500)
+            ):
+                if course.id not in by_course:
+                    by_course[course.id] = {"course": course.to_dict(), "conflicts_with": []}
+                    conflicting.append(by_course[course.id])
+                by_course[course.id]["conflicts_with"].append({
+                    "course_code": clash.course_code,
+                    "course_name": clash.name,
+                    "reason": _pair_conflict(clash, course)["reason"]
                 })
-            else:
-                non_conflicting.append(course.to_dict())
         
-        return {
+        result = {
             "success": True,
             "semester": semester,
-            "enrolled_courses": [c.to_dict() for c in enrolled_courses],
+            "enrolled_courses": enrolled_courses,
             "non_conflicting_courses": non_conflicting,
             "conflicting_courses": conflicting,
             "stats": {
-                "total_available": len(available_courses),
-                "non_conflicting": len(non_conflicting),
+                "total_available": non_conflicting_total + len(conflicting),
+                "non_conflicting": non_conflicting_total,
                 "conflicting": len(conflicting)
             }
         }
+        if limit is not None:
+            has_more = offset + len(non_conflicting) < non_conflicting_total
+            result["has_more"] = has_more
+            result["next_offset"] = offset + len(non_conflicting) if has_more else None
+        return result
     
     except Exception as e:
         return {"success": False, "error": str(e)}
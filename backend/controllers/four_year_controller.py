@@ -1,21 +1,22 @@
 from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import Field
+from typing import Annotated, List, Optional
 from sqlalchemy.orm import Session
 
+from ..api_models import CreditCap, RequestModel
 from ..tables.database import get_db
 from ..services.pathway_optimizer import optimize_pathway
 
 router = APIRouter(prefix="/api/plan", tags=["plan"])
 
 
-class FourYearRequest(BaseModel):
+class FourYearRequest(RequestModel):
     pathway_id: Optional[int] = None
     pathway_code: Optional[str] = None
     completed_course_codes: Optional[List[str]] = []
-    years: Optional[int] = 4
+    years: Optional[Annotated[int, Field(ge=1, le=12)]] = 4
     include_summer: Optional[bool] = False
-    max_credits_per_semester: Optional[int] = 15
+    max_credits_per_semester: Optional[CreditCap] = 15
     allow_overfull: Optional[bool] = False
     reserve_seats: Optional[bool] = False
     balance_load: Optional[bool] = True
@@ -50,18 +51,39 @@ def plan_four_year(request: FourYearRequest, db: Session = Depends(get_db)):
     if len(plan) < max_terms:
         # create future term labels by advancing from last scheduled term (or current if none)
         last_label = plan[-1]['semester'] if plan else None
-        sem_label = last_label or None
         # if no last label, optimizer used default current semester; we will not attempt to reconstruct exact labels
-        while len(plan) < max_terms:
-            if sem_label:
-                sem_label = _advance_label(sem_label)
-            else:
-                sem_label = f"TBD {len(plan)+1}"
+        if last_label:
+            labels = _following_labels(last_label, max_terms - len(plan))
+        else:
+            labels = (f"TBD {n}" for n in range(len(plan) + 1, max_terms + 1))
+        for sem_label in labels:
             plan.append({'semester': sem_label, 'courses': [], 'total_credits': 0})
 
     return plan
 
 
+_TERM_ORDER = ["Fall", "Spring", "Summer"]
+
+
+def _following_labels(label: str, count: int):
+    """the next `count` labels after `label`, parsing it once and stepping (term, year) as ints"""
+    parts = label.split()
+    try:
+        idx = _TERM_ORDER.index(parts[0])
+        year = int(parts[1])
+    except (IndexError, ValueError):
+        # labels _advance_label cannot parse into a term and year; step them one at a time
+        for _ in range(count):
+            label = _advance_label(label)
+            yield label
+        return
+    for _ in range(count):
+        if idx == 0:  # Fall -> Spring crosses into the next year
+            year += 1
+        idx = (idx + 1) % len(_TERM_ORDER)
+        yield f"{_TERM_ORDER[idx]} {year}"
+
+
 def _advance_label(label: str) -> str:
     # utility used for padding labels; mirror optimizer's next semester progression
     parts = label.split()
@@ -1,23 +1,56 @@
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
-from typing import List, Optional, Dict
-from sqlalchemy.orm import Session
+from typing import Any, List, Optional, Dict
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only
 
+from ..api_models import CreditCap, RequestModel, TermCount
 from ..tables.database import get_db
+from ..services import cache
+from ..tables.course import Course
+from ..tables.course_offering import CourseOffering
+from ..tables.course_prerequisite import CoursePrerequisite
+from ..tables.pathway import Pathway, PathwayRequirement
+from ..tables.student_preferences import StudentPreferences
 from ..services.pathway_optimizer import optimize_pathway, gather_pathway_courses, build_prereq_map
 from ..services.global_optimizer import optimize_pathway_exact
 
 router = APIRouter(prefix="/api/optimizer", tags=["optimizer"])
 
+# identical optimize requests (refreshes, shared advising pathways) reuse the plan instead of
+# re-running the solver; cleared after any commit that writes a row the plans are built from,
+# and capped at 5 minutes for other workers' writes
+_plan_cache = TTLCache(maxsize=1024, ttl=300)
+_plan_lock = threading.Lock()
 
-class OptimizeRequest(BaseModel):
+
+def _clear_plan_cache() -> None:
+    with _plan_lock:
+        _plan_cache.clear()
+
+
+cache.register(_clear_plan_cache, Course, CourseOffering, CoursePrerequisite, Pathway, PathwayRequirement, StudentPreferences)
+
+# background solves started through /optimize/start: task id -> Future, kept 10 minutes so
+# clients can poll /optimize/result and identical requests share one solve
+_solver_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='optimizer')
+_tasks = TTLCache(maxsize=1024, ttl=600)
+_tasks_lock = threading.Lock()
+
+
+class OptimizeRequest(RequestModel):
     pathway_id: Optional[int] = None
     pathway_code: Optional[str] = None
     completed_course_codes: Optional[List[str]] = []
-    max_credits_per_semester: Optional[int] = 15
+    max_credits_per_semester: Optional[CreditCap] = 15
     user_id: Optional[int] = None
     start_semester: Optional[str] = None
-    max_terms: Optional[int] = 12
+    max_terms: Optional[TermCount] = 12
     allow_overfull: Optional[bool] = False
     reserve_seats: Optional[bool] = False
     solver: Optional[str] = 'heuristic'  # 'heuristic' or 'exact'
@@ -29,7 +62,7 @@ class SemesterPlan(BaseModel):
     total_credits: int
 
 
-class ScoreRequest(BaseModel):
+class ScoreRequest(RequestModel):
     course_ids: List[int]
     weights: Optional[Dict[str, float]] = None
     user_id: Optional[int] = None
@@ -37,10 +70,27 @@ class ScoreRequest(BaseModel):
     preferences: Optional[Dict[str, Any]] = None
 
 
-@router.post("/", response_model=List[SemesterPlan])
-def optimize(request: OptimizeRequest, db: Session = Depends(get_db)):
+def _solve(request: OptimizeRequest, db: Session) -> List[Dict]:
     if not request.pathway_id and not request.pathway_code:
         raise HTTPException(status_code=400, detail="pathway_id or pathway_code required")
+    # reserve_seats writes enrollment counts, so those requests always run the solver
+    key = None
+    if not request.reserve_seats:
+        key = (
+            request.pathway_id,
+            request.pathway_code,
+            frozenset(request.completed_course_codes or []),
+            request.max_credits_per_semester or 15,
+            request.user_id,
+            request.start_semester,
+            request.max_terms or 12,
+            bool(request.allow_overfull),
+            (request.solver or 'heuristic').lower(),
+        )
+        with _plan_lock:
+            cached = _plan_cache.get(key)
+        if cached is not None:
+            return cached
     if request.solver and request.solver.lower() == 'exact':
         courses = gather_pathway_courses(db, pathway_id=request.pathway_id, pathway_code=request.pathway_code)
         prereq_map = build_prereq_map(db)
@@ -72,9 +122,86 @@ def optimize(request: OptimizeRequest, db: Session = Depends(get_db)):
     if plan is None:
         raise HTTPException(status_code=500, detail="Failed to generate plan")
 
+    if key is not None:
+        with _plan_lock:
+            _plan_cache[key] = plan
     return plan
 
 
+@router.post("/", response_model=List[SemesterPlan])
+def optimize(request: OptimizeRequest, db: Session = Depends(get_db)):
+    return _solve(request, db)
+
+
+def _task_id(request: OptimizeRequest) -> str:
+    """sha256 of the canonicalized request, so equal requests map to the same task"""
+    payload = request.model_dump()
+    payload['completed_course_codes'] = sorted(set(payload['completed_course_codes'] or []))
+    payload['solver'] = (payload['solver'] or 'heuristic').lower()
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _solve_in_background(request: OptimizeRequest) -> List[Dict]:
+    # the request's session is closed before the solve runs, so the job opens its own
+    from ..tables.database_session import SessionLocal
+    db = SessionLocal()
+    try:
+        return _solve(request, db)
+    finally:
+        db.close()
+
+
+@router.post("/optimize/start")
+def start_optimize(request: OptimizeRequest):
+    """Queue a solve on the worker pool and return a task id to poll.
+
+    Keeps long exact solves off the request thread and its pooled DB connection.
+    """
+    if not request.pathway_id and not request.pathway_code:
+        raise HTTPException(status_code=400, detail="pathway_id or pathway_code required")
+    if request.reserve_seats:
+        # seat holds must not be deduplicated or replayed from a cached task
+        raise HTTPException(status_code=400, detail="reserve_seats requests must use POST /api/optimizer/")
+    task_id = _task_id(request)
+    with _tasks_lock:
+        future = _tasks.get(task_id)
+        if future is None or (future.done() and future.exception() is not None):
+            future = _tasks[task_id] = _solver_pool.submit(_solve_in_background, request)
+    return {"task_id": task_id, "status": "done" if future.done() else "pending"}
+
+
+@router.get("/optimize/result/{task_id}")
+def optimize_result(task_id: str):
+    with _tasks_lock:
+        future = _tasks.get(task_id)
+    if future is None:
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found or expired")
+    if not future.done():
+        return {"task_id": task_id, "status": "pending"}
+    error = future.exception()
+    if error is not None:
+        detail = error.detail if isinstance(error, HTTPException) else str(error)
+        return {"task_id": task_id, "status": "failed", "error": detail}
+    return {"task_id": task_id, "status": "done", "plan": future.result()}
+
+
+@router.post("/reset-cache")
+def reset_cache():
+    """Drop every cached plan, prerequisite map and listing in this worker.
+
+    Writes through the ORM already clear these on commit; this is for data changed out of
+    band (manual SQL, restores) that should not wait for the TTLs.
+    """
+    return {"success": True, "caches_cleared": cache.clear_all()}
+
+
+# Course attributes services.score.score_courses reads
+_SCORED_COLUMNS = (
+    Course.id, Course.course_code, Course.semester, Course.days_of_week,
+    Course.start_time, Course.end_time, Course.instructor, Course.location,
+)
+
+
 @router.post('/score')
 def score_schedule_endpoint(req: ScoreRequest, db: Session = Depends(get_db)):
     """Score a proposed schedule (list of course ids) and return breakdown."""
@@ -92,10 +219,16 @@ def score_schedule_endpoint(req: ScoreRequest, db: Session = Depends(get_db)):
             prefs = prefs_obj.to_dict()
 
     # score_schedule in service expects course ids and db; we will fetch courses and call score_courses to pass preferences
-    from tables.course import Course as CourseModel
-    courses = db.query(CourseModel).filter(CourseModel.id.in_(req.course_ids)).all()
-    if len(courses) != len(req.course_ids):
-        return {'error': 'One or more courses not found', 'requested': len(req.course_ids), 'found': len(courses)}
+    # only the attributes score_courses reads are loaded; the id set doubles as the existence check
+    requested = set(req.course_ids)
+    courses = db.execute(
+        select(Course)
+        .options(load_only(*_SCORED_COLUMNS))
+        .where(Course.id.in_(requested))
+    ).scalars().all()
+    if len(courses) != len(requested):
+        missing = sorted(requested - {c.id for c in courses})
+        return {'error': 'One or more courses not found', 'requested': len(requested), 'found': len(courses), 'missing': missing}
 
     result = score_service.score_courses(courses, weights=req.weights, db=db, preferences=prefs)
     return result
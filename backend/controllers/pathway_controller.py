@@ -1,56 +1,101 @@
 from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Optional
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from ..tables.pathway import Pathway, PathwayRequirement
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.orm import Session, selectinload
+from ..tables.pathway import Pathway, PathwayRequirement, requirement_courses
 from ..tables.course import Course
+from ..api_models import RequestModel
 from ..tables.database import get_db
 
 router = APIRouter(prefix="/api/pathways", tags=["pathways"])
 
+def _with_requirements():
+    """PathwayResponse walks requirements -> courses; load each level with one IN query.
+
+    Built per call rather than at import: creating a loader option configures every mapper,
+    and importing the router must not depend on that.
+    """
+    return selectinload(Pathway.requirements).selectinload(PathwayRequirement.courses)
+
 class RequirementBase(BaseModel):
     name: str
-    description: Optional[str]
+    description: Optional[str] = None
     credits_required: int
-    course_count_required: Optional[int]
+    course_count_required: Optional[int] = None
 
-class RequirementCreate(RequirementBase):
+class RequirementCreate(RequirementBase, RequestModel):
     course_ids: List[str]
 
 class RequirementResponse(RequirementBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     pathway_id: int
     courses: List[dict]
 
-    class Config:
-        orm_mode = True
-
 class PathwayBase(BaseModel):
     name: str
     code: str
-    description: Optional[str]
+    description: Optional[str] = None
     total_credits: int
 
-class PathwayCreate(PathwayBase):
+class PathwayCreate(PathwayBase, RequestModel):
     requirements: List[RequirementCreate]
 
 class PathwayResponse(PathwayBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     requirements: List[RequirementResponse]
 
-    class Config:
-        orm_mode = True
+def _courses_by_id(requirements: List[RequirementCreate], db: Session) -> dict:
+    """Load every course named by the requirements in one query, keyed by the id as sent."""
+    wanted = {cid for req in requirements for cid in req.course_ids}
+    if not wanted:
+        return {}
+    # course ids arrive as strings; ones that are not integers can never match
+    ids = {int(cid) for cid in wanted if cid.isdigit()}
+    found = {str(c.id): c for c in db.query(Course).filter(Course.id.in_(ids)).all()} if ids else {}
+    missing = sorted(wanted - found.keys())
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Courses not found: {', '.join(missing)}")
+    return found
+
+def _add_requirements(pathway_id: int, requirements: List[RequirementCreate], courses_by_id: dict, db: Session) -> None:
+    """Insert the requirements in one flush and all their course links in one executemany."""
+    db_requirements = [
+        PathwayRequirement(
+            pathway_id=pathway_id,
+            name=req.name,
+            description=req.description,
+            credits_required=req.credits_required,
+            course_count_required=req.course_count_required
+        )
+        for req in requirements
+    ]
+    db.add_all(db_requirements)
+    db.flush()  # batched INSERT ... RETURNING gives every requirement its id
+
+    links = [
+        {'requirement_id': db_requirement.id, 'course_id': courses_by_id[course_id].id}
+        for db_requirement, req in zip(db_requirements, requirements)
+        for course_id in req.course_ids
+    ]
+    if links:
+        db.execute(requirement_courses.insert(), links)
 
 @router.post("/", response_model=PathwayResponse)
 def create_pathway(pathway: PathwayCreate, db: Session = Depends(get_db)):
     # Check if pathway with same code exists
-    existing = db.query(Pathway).filter(Pathway.code == pathway.code).first()
+    existing = db.query(db.query(Pathway).filter(Pathway.code == pathway.code).exists()).scalar()
     if existing:
         raise HTTPException(
             status_code=400,
             detail=f"Pathway with code {pathway.code} already exists"
         )
 
+    courses_by_id = _courses_by_id(pathway.requirements, db)
+
     # Create new pathway
     db_pathway = Pathway(
         name=pathway.name,
@@ -61,22 +106,9 @@ def create_pathway(pathway: PathwayCreate, db: Session = Depends(get_db)):
     db.add(db_pathway)
     db.flush()  # Get the ID without committing
 
-    # Create requirements
-    for req in pathway.requirements:
-        db_requirement = PathwayRequirement(
-            pathway_id=db_pathway.id,
-            name=req.name,
-            description=req.description,
-            credits_required=req.credits_required,
-            course_count_required=req.course_count_required
-        )
-        db.add(db_requirement)
-        
-        # Add courses to requirement
-        for course_id in req.course_ids:
-            db_requirement.courses.append(db.query(Course).get(course_id))
-
+    # Create requirements and their course links
     try:
+        _add_requirements(db_pathway.id, pathway.requirements, courses_by_id, db)
         db.commit()
         db.refresh(db_pathway)
     except Exception as e:
@@ -91,11 +123,11 @@ def get_pathways(
     limit: int = 100,
     db: Session = Depends(get_db)
 ):
-    return db.query(Pathway).offset(skip).limit(limit).all()
+    return db.query(Pathway).options(_with_requirements()).offset(skip).limit(limit).all()
 
 @router.get("/{pathway_id}", response_model=PathwayResponse)
 def get_pathway(pathway_id: int, db: Session = Depends(get_db)):
-    pathway = db.query(Pathway).filter(Pathway.id == pathway_id).first()
+    pathway = db.get(Pathway, pathway_id, options=[_with_requirements()])
     if not pathway:
         raise HTTPException(
             status_code=404,
@@ -110,15 +142,17 @@ def update_pathway(
     db: Session = Depends(get_db)
 ):
     # Check if pathway exists
-    db_pathway = db.query(Pathway).filter(Pathway.id == pathway_id).first()
+    db_pathway = db.get(Pathway, pathway_id)
     if not db_pathway:
         raise HTTPException(
             status_code=404,
             detail=f"Pathway with id {pathway_id} not found"
         )
 
+    courses_by_id = _courses_by_id(pathway_update.requirements, db)
+
     # Update pathway fields
-    for key, value in pathway_update.dict(exclude={'requirements'}).items():
+    for key, value in pathway_update.model_dump(exclude={'requirements'}).items():
         setattr(db_pathway, key, value)
 
     # Update requirements
@@ -127,22 +161,9 @@ def update_pathway(
         PathwayRequirement.pathway_id == pathway_id
     ).delete()
 
-    # Add new requirements
-    for req in pathway_update.requirements:
-        db_requirement = PathwayRequirement(
-            pathway_id=pathway_id,
-            name=req.name,
-            description=req.description,
-            credits_required=req.credits_required,
-            course_count_required=req.course_count_required
-        )
-        db.add(db_requirement)
-        
-        # Add courses to requirement
-        for course_id in req.course_ids:
-            db_requirement.courses.append(db.query(Course).get(course_id))
-
+    # Add new requirements and their course links
     try:
+        _add_requirements(pathway_id, pathway_update.requirements, courses_by_id, db)
         db.commit()
         db.refresh(db_pathway)
     except Exception as e:
@@ -153,7 +174,7 @@ def update_pathway(
 
 @router.delete("/{pathway_id}")
 def delete_pathway(pathway_id: int, db: Session = Depends(get_db)):
-    pathway = db.query(Pathway).filter(Pathway.id == pathway_id).first()
+    pathway = db.get(Pathway, pathway_id)
     if not pathway:
         raise HTTPException(
             status_code=404,
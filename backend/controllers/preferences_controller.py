@@ -1,17 +1,34 @@
+import re
+from datetime import time
+
 from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, Optional
 from sqlalchemy.orm import Session
 
+from ..api_models import CreditCap, RequestModel
 from ..tables.database import get_db
 from ..tables.student_preferences import StudentPreferences
 
 router = APIRouter(prefix="/api/preferences", tags=["preferences"])
 
+_TIME_RE = re.compile(r'^(\d{2}):(\d{2}):(\d{2})$')
+
+
+def _parse_time(value: str) -> time:
+    """HH:MM:SS -> time, without going through strptime's format interpreter"""
+    match = _TIME_RE.match(value)
+    try:
+        if not match:
+            raise ValueError
+        h, m, s = match.groups()
+        return time(int(h), int(m), int(s))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid time '{value}', expected HH:MM:SS")
+
 
-class PreferencesIn(BaseModel):
+class PreferencesIn(RequestModel):
     user_id: Optional[int] = None
-    max_credits_per_term: Optional[int] = None
+    max_credits_per_term: Optional[CreditCap] = None
     unavailable_days: Optional[str] = None
     avoid_mornings: Optional[bool] = False
     avoid_evenings: Optional[bool] = False
@@ -27,7 +44,7 @@ class PreferencesIn(BaseModel):
     notes: Optional[str] = None
 
 
-@router.get("/{user_id}")
+@router.get("/{user_id}", response_model=Dict[str, Any])
 def get_preferences(user_id: int, db: Session = Depends(get_db)):
     prefs = db.query(StudentPreferences).filter(StudentPreferences.user_id == user_id).first()
     if not prefs:
@@ -35,7 +52,7 @@ def get_preferences(user_id: int, db: Session = Depends(get_db)):
     return prefs.to_dict()
 
 
-@router.post("/{user_id}")
+@router.post("/{user_id}", response_model=Dict[str, Any])
 def set_preferences(user_id: int, prefs_in: PreferencesIn, db: Session = Depends(get_db)):
     prefs = db.query(StudentPreferences).filter(StudentPreferences.user_id == user_id).first()
     if not prefs:
@@ -52,11 +69,9 @@ def set_preferences(user_id: int, prefs_in: PreferencesIn, db: Session = Depends
     if prefs_in.preferred_instructors is not None:
         prefs.preferred_instructors = ','.join(prefs_in.preferred_instructors)
     if prefs_in.earliest_start_time is not None:
-        from datetime import datetime
-        prefs.earliest_start_time = datetime.strptime(prefs_in.earliest_start_time, '%H:%M:%S').time()
+        prefs.earliest_start_time = _parse_time(prefs_in.earliest_start_time)
     if prefs_in.latest_end_time is not None:
-        from datetime import datetime
-        prefs.latest_end_time = datetime.strptime(prefs_in.latest_end_time, '%H:%M:%S').time()
+        prefs.latest_end_time = _parse_time(prefs_in.latest_end_time)
     if prefs_in.max_days_per_week is not None:
         prefs.max_days_per_week = prefs_in.max_days_per_week
     if prefs_in.preferred_days is not None:
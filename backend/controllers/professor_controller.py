@@ -1,10 +1,15 @@
 from typing import List, Dict, Optional
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from ..tables.professor import Professor
 
 #functions that operate on the professor table
 #currently has create, read, update, and delete functions. as well as bulk listing and populating functions
 
+#fields update_professor may change; email is the key and stays fixed
+_PROF_FIELDS = frozenset(("name", "title", "phone_number", "department", "portfolio_page", "profile_page"))
+
 def create_professor(data: Dict, db: Session) -> Dict:
     """
     data: { "email": str, "name": str, "title": str, ... }
@@ -12,22 +17,26 @@ def create_professor(data: Dict, db: Session) -> Dict:
     if not data.get("email"):
         return {"success": False, "error": "email is required"}
     try:
-        existing = db.query(Professor).filter(Professor.email == data["email"]).first()
-        if existing:
+        #the primary key rejects duplicates; RETURNING gives back the row without a refresh
+        row = db.execute(
+            pg_insert(Professor)
+            .values(
+                email=data["email"],
+                name=data.get("name"),
+                title=data.get("title"),
+                phone_number=data.get("phone_number"),
+                department=data.get("department"),
+                portfolio_page=data.get("portfolio_page"),
+                profile_page=data.get("profile_page"),
+            )
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(Professor.email, Professor.name)
+        ).mappings().first()
+        if row is None:
+            db.rollback()
             return {"success": False, "error": "Professor already exists"}
-        p = Professor(
-            email=data["email"],
-            name=data.get("name"),
-            title=data.get("title"),
-            phone_number=data.get("phone_number"),
-            department=data.get("department"),
-            portfolio_page=data.get("portfolio_page"),
-            profile_page=data.get("profile_page"),
-        )
-        db.add(p)
         db.commit()
-        db.refresh(p)
-        return {"success": True, "professor": {"email": p.email, "name": p.name}}
+        return {"success": True, "professor": dict(row)}
     except Exception as e:
         db.rollback()
         return {"success": False, "error": str(e)}
@@ -47,28 +56,25 @@ def get_professor_by_email(email: str, db: Session) -> Optional[Dict]:
     }
 
 def list_professors(db: Session) -> List[Dict]:
-    rows = db.query(Professor).all()
-    return [
-        {
-            "email": r.email,
-            "name": r.name,
-            "title": r.title,
-            "phone_number": r.phone_number,
-            "department": r.department,
-            "portfolio_page": r.portfolio_page,
-            "profile_page": r.profile_page,
-        }
-        for r in rows
-    ]
+    #read-only listing: select the columns as plain rows instead of building Professor instances
+    rows = db.execute(select(
+        Professor.email,
+        Professor.name,
+        Professor.title,
+        Professor.phone_number,
+        Professor.department,
+        Professor.portfolio_page,
+        Professor.profile_page,
+    )).mappings()
+    return [dict(r) for r in rows]
 
 def update_professor(email: str, updates: Dict, db: Session) -> Dict:
     p = db.query(Professor).filter(Professor.email == email).first()
     if not p:
         return {"success": False, "error": "Professor not found"}
     try:
-        for k in ("name", "title", "phone_number", "department", "portfolio_page", "profile_page"):
-            if k in updates:
-                setattr(p, k, updates[k])
+        for k in _PROF_FIELDS & updates.keys():
+            setattr(p, k, updates[k])
         db.commit()
         db.refresh(p)
         return {"success": True, "professor": get_professor_by_email(email, db)}
@@ -88,31 +94,38 @@ def delete_professor(email: str, db: Session) -> Dict:
         db.rollback()
         return {"success": False, "error": str(e)}
 
-def populate_from_list(entries: List[Dict], db: Session) -> Dict:
+def populate_from_list(entries: List[Dict], db: Session, batch_size: int = 1000) -> Dict:
     """
     entries: list of dicts with keys matching model fields.
     Inserts ignoring duplicates (skips existing emails).
     """
+    rows = {}
+    for entry in entries:
+        email = entry.get("email") or entry.get("Email")
+        if not email or email in rows:
+            continue
+        rows[email] = {
+            "email": email,
+            "name": entry.get("name") or entry.get("Name"),
+            "title": entry.get("title") or entry.get("Title"),
+            "phone_number": entry.get("phone_number") or entry.get("Phone"),
+            "department": entry.get("department") or entry.get("Department"),
+            "portfolio_page": entry.get("portfolio_page") or entry.get("Portfolio"),
+            "profile_page": entry.get("profile_page") or entry.get("Profile_Page") or entry.get("Profile Page"),
+        }
+    rows = list(rows.values())
+
     try:
         inserted = 0
-        for entry in entries:
-            email = entry.get("email") or entry.get("Email")
-            if not email:
-                continue
-            exists = db.query(Professor).filter(Professor.email == email).first()
-            if exists:
-                continue
-            p = Professor(
-                email=email,
-                name=entry.get("name") or entry.get("Name"),
-                title=entry.get("title") or entry.get("Title"),
-                phone_number=entry.get("phone_number") or entry.get("Phone"),
-                department=entry.get("department") or entry.get("Department"),
-                portfolio_page=entry.get("portfolio_page") or entry.get("Portfolio"),
-                profile_page=entry.get("profile_page") or entry.get("Profile_Page") or entry.get("Profile Page"),
+        #the primary key decides what already exists, atomically and in the same round trip
+        for start in range(0, len(rows), batch_size):
+            stmt = (
+                pg_insert(Professor)
+                .values(rows[start:start + batch_size])
+                .on_conflict_do_nothing(index_elements=["email"])
+                .returning(Professor.email)
             )
-            db.add(p)
-            inserted += 1
+            inserted += len(db.execute(stmt).all())
         db.commit()
         return {"success": True, "inserted": inserted}
     except Exception as e:
@@ -1,20 +1,120 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime, timedelta
+from sqlalchemy import func, insert, or_, select, update
 from sqlalchemy.orm import Session
 
+from ..api_models import HoldMinutes, RequestModel
 from ..tables.database import get_db
 from ..tables.reservation import Reservation
 from ..tables.course_offering import CourseOffering
 
-router = APIRouter(prefix="/api/reservations", tags=["reservations"])
+logger = logging.getLogger(__name__)
 
+# how often held reservations past expires_at are marked expired
+EXPIRE_SWEEP_SECONDS = 30
 
-class ReservationCreate(BaseModel):
+
+def expire_stale_reservations(db: Session, now: Optional[datetime] = None) -> int:
+    """Mark every held reservation past its expiry as expired in one UPDATE; returns the count.
+
+    Seat checks already ignore expired holds through expires_at, so this only keeps status
+    truthful for listings and keeps the 'held' set small.
+    """
+    result = db.execute(
+        update(Reservation)
+        .where(Reservation.status == 'held', Reservation.expires_at <= (now or datetime.utcnow()))
+        .values(status='expired')
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def _sweep_once() -> int:
+    from ..tables.database_session import SessionLocal
+    db = SessionLocal()
+    try:
+        return expire_stale_reservations(db)
+    finally:
+        db.close()
+
+
+async def _sweep_expired_holds() -> None:
+    while True:
+        await asyncio.sleep(EXPIRE_SWEEP_SECONDS)
+        try:
+            await asyncio.to_thread(_sweep_once)
+        except Exception:
+            logger.exception("reservation expiry sweep failed")
+
+
+@asynccontextmanager
+async def _lifespan(app):
+    sweeper = asyncio.create_task(_sweep_expired_holds())
+    try:
+        yield
+    finally:
+        sweeper.cancel()
+
+
+router = APIRouter(prefix="/api/reservations", tags=["reservations"], lifespan=_lifespan)
+
+
+def _active_holds(offering_id, now: datetime, exclude_reservation_id: Optional[int] = None):
+    """COUNT of held, unexpired reservations for an offering (an id or a correlated column).
+
+    When checked in python, run it after the offering row is locked: under READ COMMITTED a
+    count folded into the locking SELECT would use the snapshot taken before the lock wait
+    and miss holds that the previous lock owner just committed.
+    """
+    # plain COUNT over ix_reservation_offering_status_expires; Query.count() would wrap it in a subquery
+    stmt = select(func.count(Reservation.id)).where(
+        Reservation.offering_id == offering_id,
+        Reservation.status == 'held',
+        Reservation.expires_at > now,
+    )
+    if exclude_reservation_id is not None:
+        stmt = stmt.where(Reservation.id != exclude_reservation_id)
+    return stmt
+
+
+@dataclass(slots=True)
+class ReservationView:
+    """A reservation row as returned to clients, built straight from a RETURNING row."""
+    id: int
+    offering_id: int
+    user_id: Optional[int]
+    status: str
+    created_at: Optional[str]
+    expires_at: Optional[str]
+    seats: int
+    notes: Optional[str]
+
+    @classmethod
+    def from_row(cls, row) -> 'ReservationView':
+        created_at, expires_at = row['created_at'], row['expires_at']
+        return cls(
+            id=row['id'],
+            offering_id=row['offering_id'],
+            user_id=row['user_id'],
+            status=row['status'],
+            created_at=created_at.isoformat() if created_at else None,
+            expires_at=expires_at.isoformat() if expires_at else None,
+            seats=row['seats'],
+            notes=row['notes'],
+        )
+
+
+class ReservationCreate(RequestModel):
     offering_id: int
     user_id: Optional[int] = None
-    hold_minutes: Optional[int] = 15
+    hold_minutes: Optional[HoldMinutes] = 15
 
 
 class ReservationOut(BaseModel):
@@ -33,7 +133,7 @@ def create_reservation(req: ReservationCreate, allow_overfull: bool = Query(Fals
     now = datetime.utcnow()
     hold_until = now + timedelta(minutes=req.hold_minutes or 15)
 
-    offering = db.query(CourseOffering).filter(CourseOffering.id == req.offering_id).with_for_update().first()
+    offering = db.get(CourseOffering, req.offering_id, with_for_update=True)
     if not offering:
         raise HTTPException(status_code=404, detail="Offering not found")
 
@@ -41,77 +141,78 @@ def create_reservation(req: ReservationCreate, allow_overfull: bool = Query(Fals
     enrolled = offering.enrolled or 0
 
     # count active held reservations for this offering
-    active_reserved = db.query(Reservation).filter(
-        Reservation.offering_id == offering.id,
-        Reservation.status == 'held',
-        Reservation.expires_at > now
-    ).count()
+    active_reserved = db.execute(_active_holds(offering.id, now)).scalar_one()
 
     if capacity is not None:
         available = capacity - enrolled - active_reserved
         if available <= 0 and not allow_overfull:
             raise HTTPException(status_code=400, detail="No seats available")
 
-    r = Reservation(
-        offering_id=offering.id,
-        user_id=req.user_id,
-        status='held',
-        created_at=now,
-        expires_at=hold_until,
-        seats=1,
-    )
-    db.add(r)
+    # RETURNING hands back the stored row; no refresh SELECT or ORM instance needed
+    row = db.execute(
+        insert(Reservation)
+        .values(
+            offering_id=offering.id,
+            user_id=req.user_id,
+            status='held',
+            created_at=now,
+            expires_at=hold_until,
+            seats=1,
+        )
+        .returning(Reservation.__table__)
+    ).mappings().one()
     db.commit()
-    db.refresh(r)
-    return r.to_dict()
+    return ReservationView.from_row(row)
 
 
 @router.post("/{reservation_id}/commit", response_model=ReservationOut)
 def commit_reservation(reservation_id: int, allow_overfull: bool = Query(False), db: Session = Depends(get_db)):
     now = datetime.utcnow()
-    r = db.query(Reservation).filter(Reservation.id == reservation_id).with_for_update().first()
+    r = db.get(Reservation, reservation_id, with_for_update=True)
     if not r:
         raise HTTPException(status_code=404, detail="Reservation not found")
     if r.status != 'held':
         raise HTTPException(status_code=400, detail=f"Reservation not in held state: {r.status}")
     if r.expires_at and r.expires_at < now:
-        r.status = 'expired'
-        db.add(r)
-        db.commit()
+        # the periodic sweep records the status; the request only reports it
         raise HTTPException(status_code=400, detail="Reservation expired")
 
-    offering = db.query(CourseOffering).filter(CourseOffering.id == r.offering_id).with_for_update().first()
-    if not offering:
-        raise HTTPException(status_code=404, detail="Offering not found")
-
-    capacity = offering.capacity
-    enrolled = offering.enrolled or 0
-    # count other active held reservations (excluding this one)
-    active_reserved = db.query(Reservation).filter(
-        Reservation.offering_id == offering.id,
-        Reservation.status == 'held',
-        Reservation.expires_at > now,
-        Reservation.id != r.id
-    ).count()
-
-    if capacity is not None:
-        available = capacity - enrolled - active_reserved
-        if available <= 0 and not allow_overfull:
-            raise HTTPException(status_code=400, detail="No seats available to commit")
-
-    # commit: increment enrolled and mark reservation committed
-    offering.enrolled = enrolled + (r.seats or 1)
-    r.status = 'committed'
-    db.add(offering)
-    db.add(r)
+    seats = r.seats or 1
+    # take the seats in one UPDATE; the database re-checks capacity against the latest
+    # enrolled value, so no offering lock is held while python decides
+    take_seats = (
+        update(CourseOffering)
+        .where(CourseOffering.id == r.offering_id)
+        .values(enrolled=func.coalesce(CourseOffering.enrolled, 0) + seats)
+        .execution_options(synchronize_session=False)
+    )
+    if not allow_overfull:
+        # other active holds (excluding this one) keep their seats
+        other_holds = _active_holds(CourseOffering.id, now, exclude_reservation_id=r.id).scalar_subquery()
+        take_seats = take_seats.where(or_(
+            CourseOffering.capacity.is_(None),
+            func.coalesce(CourseOffering.enrolled, 0) + seats + other_holds <= CourseOffering.capacity,
+        ))
+    if db.execute(take_seats).rowcount == 0:
+        if db.get(CourseOffering, r.offering_id) is None:
+            raise HTTPException(status_code=404, detail="Offering not found")
+        raise HTTPException(status_code=400, detail="No seats available to commit")
+
+    # mark reservation committed
+    row = db.execute(
+        update(Reservation)
+        .where(Reservation.id == r.id)
+        .values(status='committed')
+        .returning(Reservation.__table__)
+        .execution_options(synchronize_session=False)
+    ).mappings().one()
     db.commit()
-    db.refresh(r)
-    return r.to_dict()
+    return ReservationView.from_row(row)
 
 
 @router.delete("/{reservation_id}")
 def release_reservation(reservation_id: int, db: Session = Depends(get_db)):
-    r = db.query(Reservation).filter(Reservation.id == reservation_id).first()
+    r = db.get(Reservation, reservation_id)
     if not r:
         raise HTTPException(status_code=404, detail="Reservation not found")
     if r.status == 'committed':
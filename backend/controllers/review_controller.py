@@ -1,25 +1,97 @@
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, NamedTuple, Optional
 
-from sqlalchemy import func, case
-from sqlalchemy.orm import Session
+from cachetools import TTLCache
+from sqlalchemy import String, func, case, insert, literal, select, update
+from sqlalchemy.orm import Session, joinedload, raiseload
 
+from ..services import cache
 from ..tables.course import Course
 from ..tables.course_review import CourseReview
 
 
-def _resolve_course(db: Session, course_id: Optional[int] = None, course_code: Optional[str] = None, semester: Optional[str] = None) -> Optional[Course]:
-    query = db.query(Course)
+# the columns CourseReview.to_dict() reads, with course_code taken from the join instead of
+# a lazy load of review.course per row
+_REVIEW_COLUMNS = (
+    CourseReview.id, CourseReview.course_id, Course.course_code, CourseReview.semester,
+    CourseReview.user_identifier, CourseReview.user_name, CourseReview.rating,
+    CourseReview.difficulty, CourseReview.workload_hours, CourseReview.would_recommend,
+    CourseReview.comment, CourseReview.created_at, CourseReview.updated_at,
+)
 
-    if course_id is not None:
-        return query.filter(Course.id == course_id).first()
 
-    if course_code:
-        query = query.filter(Course.course_code == course_code)
-        if semester:
-            query = query.filter(Course.semester == semester)
-        return query.first()
+# fields update_review may change
+_REVIEW_FIELDS = frozenset(("rating", "difficulty", "workload_hours", "would_recommend", "comment", "user_name"))
+
+
+def _with_course_code():
+    """Loader options for a CourseReview that will be serialized with to_dict().
+
+    to_dict() reads review.course.course_code, so that column comes in the same SELECT; any
+    other relationship access raises instead of lazy loading. Built per call: creating loader
+    options configures the mappers.
+    """
+    return [joinedload(CourseReview.course).load_only(Course.course_code), raiseload('*')]
+
+
+def _review_row(row) -> Dict:
+    review = dict(row)
+    review.pop('total', None)  # list_reviews' window count rides along on its rows
+    for key in ('created_at', 'updated_at'):
+        if review[key] is not None:
+            review[key] = review[key].isoformat()
+    return review
+
+
+class _CourseRef(NamedTuple):
+    id: int
+    course_code: str
+    semester: str
+
+
+# create_review only needs a course's id, code and semester; hot courses are looked up once
+# instead of per review. Cleared after any commit that writes courses, and capped at
+# 5 minutes for other workers' writes (a stale id then fails the insert's foreign key)
+_course_ref_cache = TTLCache(maxsize=1024, ttl=300)
+_course_ref_lock = threading.Lock()
+
 
-    return None
+def _clear_course_refs() -> None:
+    with _course_ref_lock:
+        _course_ref_cache.clear()
+
+
+cache.register(_clear_course_refs, Course)
+
+
+def _returned_review(row, course_code: Optional[str]) -> Dict:
+    """a RETURNING row of course_reviews in the shape list_reviews produces"""
+    values = {**row, "course_code": course_code}
+    return _review_row({col.key: values[col.key] for col in _REVIEW_COLUMNS})
+
+
+def _resolve_course(db: Session, course_id: Optional[int] = None, course_code: Optional[str] = None, semester: Optional[str] = None) -> Optional[_CourseRef]:
+    if course_id is not None:
+        key = ('id', course_id)
+        query = select(Course.id, Course.course_code, Course.semester).where(Course.id == course_id)
+    elif course_code:
+        key = ('code', course_code, semester)
+        query = select(Course.id, Course.course_code, Course.semester).where(Course.course_code == course_code)
+        if semester:
+            query = query.where(Course.semester == semester)
+    else:
+        return None
+
+    with _course_ref_lock:
+        ref = _course_ref_cache.get(key)
+    if ref is None:
+        row = db.execute(query.limit(1)).first()
+        if row is None:
+            return None
+        ref = _CourseRef(*row)
+        with _course_ref_lock:
+            _course_ref_cache[key] = ref
+    return ref
 
 def create_review(review_data: Dict, db: Session) -> Dict:
     try:
@@ -28,26 +100,28 @@ def create_review(review_data: Dict, db: Session) -> Dict:
         if not course:
             return {"success": False, "error": "Course not found"}
 
-        new_review = CourseReview(
-            course_id=course.id,
-            semester=review_data.get("semester") or course.semester,
-            user_identifier=review_data.get("user_identifier"),
-            user_name=review_data.get("user_name"),
-            rating=review_data["rating"],
-            difficulty=review_data.get("difficulty"),
-            workload_hours=review_data.get("workload_hours"),
-            would_recommend=review_data.get("would_recommend"),
-            comment=review_data.get("comment"),
-        )
-
-        db.add(new_review)
+        # RETURNING includes the server-side timestamps, so no refresh SELECT is needed
+        row = db.execute(
+            insert(CourseReview)
+            .values(
+                course_id=course.id,
+                semester=review_data.get("semester") or course.semester,
+                user_identifier=review_data.get("user_identifier"),
+                user_name=review_data.get("user_name"),
+                rating=review_data["rating"],
+                difficulty=review_data.get("difficulty"),
+                workload_hours=review_data.get("workload_hours"),
+                would_recommend=review_data.get("would_recommend"),
+                comment=review_data.get("comment"),
+            )
+            .returning(CourseReview.__table__)
+        ).mappings().one()
         db.commit()
-        db.refresh(new_review)
 
         return {
             "success": True,
             "message": "Review created successfully",
-            "review": new_review.to_dict()
+            "review": _returned_review(row, course.course_code)
         }
     except Exception as e:
         db.rollback()
@@ -55,23 +129,54 @@ def create_review(review_data: Dict, db: Session) -> Dict:
 
 def list_reviews(db: Session, course_id: Optional[int] = None, course_code: Optional[str] = None, semester: Optional[str] = None, limit: int = 50, offset: int = 0) -> Dict:
     try:
-        query = db.query(CourseReview).join(Course)
+        filters = []
 
         if course_id is not None:
-            query = query.filter(CourseReview.course_id == course_id)
+            filters.append(CourseReview.course_id == course_id)
         elif course_code:
-            query = query.filter(Course.course_code == course_code)
+            filters.append(Course.course_code == course_code)
             if semester:
-                query = query.filter(CourseReview.semester == semester)
+                filters.append(CourseReview.semester == semester)
         elif semester:
-            query = query.filter(CourseReview.semester == semester)
+            filters.append(CourseReview.semester == semester)
 
-        total = query.count()
-        reviews = query.order_by(CourseReview.created_at.desc()).limit(limit).offset(offset).all()
+        if course_id is not None:
+            # every row belongs to one course: read course_reviews alone over
+            # ix_course_review_course_created and fill course_code from a single lookup
+            course = _resolve_course(db, course_id=course_id)
+            code = literal(course.course_code if course else None, String).label('course_code')
+            page = select(*(code if col is Course.course_code else col for col in _REVIEW_COLUMNS))
+        else:
+            page = select(*_REVIEW_COLUMNS).join(Course, CourseReview.course_id == Course.id)
+        # the window count is taken over every filtered row before LIMIT/OFFSET, so the
+        # total arrives with the page instead of from a second query
+        rows = db.execute(
+            page
+            .add_columns(func.count().over().label('total'))
+            .where(*filters)
+            .order_by(CourseReview.created_at.desc())
+            .limit(limit)
+            .offset(offset)
+            .execution_options(yield_per=200)
+        ).mappings()
+
+        # rows arrive in batches of 200 and are converted as they stream; one list is built
+        total = 0
+        reviews = []
+        for row in rows:
+            total = row['total']
+            reviews.append(_review_row(row))
+        if not reviews and offset:
+            # a page past the end carries no total; count separately
+            count_query = select(func.count()).select_from(CourseReview)
+            if course_id is None and course_code:
+                # only the course_code filter needs courses; the other counts stay on course_reviews
+                count_query = count_query.join(Course, CourseReview.course_id == Course.id)
+            total = db.execute(count_query.where(*filters)).scalar()
 
         return {
             "success": True,
-            "reviews": [review.to_dict() for review in reviews],
+            "reviews": reviews,
             "metadata": {
                 "total": total,
                 "limit": limit,
@@ -83,7 +188,7 @@ def list_reviews(db: Session, course_id: Optional[int] = None, course_code: Opti
 
 def get_review(review_id: int, db: Session) -> Dict:
     try:
-        review = db.query(CourseReview).filter(CourseReview.id == review_id).first()
+        review = db.get(CourseReview, review_id, options=_with_course_code())
         if not review:
             return {"success": False, "error": "Review not found"}
         return {"success": True, "review": review.to_dict()}
@@ -92,31 +197,32 @@ def get_review(review_id: int, db: Session) -> Dict:
 
 def update_review(review_id: int, updates: Dict, db: Session) -> Dict:
     try:
-        review = db.query(CourseReview).filter(CourseReview.id == review_id).first()
-        if not review:
+        values = {field: updates[field] for field in _REVIEW_FIELDS & updates.keys() if updates[field] is not None}
+        if not values:
+            return get_review(review_id, db)
+
+        # one UPDATE of just the supplied columns, returning the row; no load, flush or refresh
+        row = db.execute(
+            update(CourseReview)
+            .where(CourseReview.id == review_id)
+            .values(**values)
+            .returning(CourseReview.__table__)
+            .execution_options(synchronize_session=False)
+        ).mappings().first()
+        if row is None:
+            db.rollback()
             return {"success": False, "error": "Review not found"}
-
-        for field in [
-            "rating",
-            "difficulty",
-            "workload_hours",
-            "would_recommend",
-            "comment",
-            "user_name"
-        ]:
-            if field in updates and updates[field] is not None:
-                setattr(review, field, updates[field])
-
         db.commit()
-        db.refresh(review)
-        return {"success": True, "review": review.to_dict()}
+
+        course = _resolve_course(db, course_id=row["course_id"])
+        return {"success": True, "review": _returned_review(row, course.course_code if course else None)}
     except Exception as e:
         db.rollback()
         return {"success": False, "error": str(e)}
 
 def delete_review(review_id: int, db: Session) -> Dict:
     try:
-        review = db.query(CourseReview).filter(CourseReview.id == review_id).first()
+        review = db.get(CourseReview, review_id)
         if not review:
             return {"success": False, "error": "Review not found"}
 
@@ -130,22 +236,29 @@ def delete_review(review_id: int, db: Session) -> Dict:
 def get_course_rating_summary(db: Session, course_id: Optional[int] = None, course_code: Optional[str] = None, semester: Optional[str] = None) -> Dict:
     try:
         query = db.query(
-            func.count(CourseReview.id).label('count'),
+            func.count().label('count'),
             func.avg(CourseReview.rating).label('avg_rating'),
             func.avg(CourseReview.difficulty).label('avg_difficulty'),
             func.avg(CourseReview.workload_hours).label('avg_workload'),
-            func.sum(case((CourseReview.would_recommend == True, 1), else_=0)).label('recommendations')
-        ).join(Course)
+            # AVG skips the NULLs, so reviews that did not answer do not count against the rate
+            func.avg(case(
+                (CourseReview.would_recommend == True, 1.0),
+                (CourseReview.would_recommend == False, 0.0),
+                else_=None
+            )).label('recommend_rate')
+        )
 
         if course_id is not None:
             query = query.filter(CourseReview.course_id == course_id)
         elif course_code:
-            query = query.filter(Course.course_code == course_code)
+            # only the course_code filter needs courses; the rest aggregates course_reviews alone
+            query = query.join(Course, CourseReview.course_id == Course.id).filter(Course.course_code == course_code)
         if semester:
             query = query.filter(CourseReview.semester == semester)
 
-        result = query.first()
-        count = result.count if result and result.count else 0
+        # an aggregate without GROUP BY always yields exactly one row
+        result = query.one()
+        count = result.count or 0
 
         if count == 0:
             return {
@@ -159,10 +272,6 @@ def get_course_rating_summary(db: Session, course_id: Optional[int] = None, cour
                 }
             }
 
-        recommend_rate = None
-        if result.recommendations is not None and count > 0:
-            recommend_rate = float(result.recommendations)/count
-
         return {
             "success": True,
             "summary": {
@@ -170,7 +279,7 @@ def get_course_rating_summary(db: Session, course_id: Optional[int] = None, cour
                 "average_rating": round(float(result.avg_rating), 2) if result.avg_rating else None,
                 "average_difficulty": round(float(result.avg_difficulty), 2) if result.avg_difficulty else None,
                 "average_workload": round(float(result.avg_workload), 2) if result.avg_workload else None,
-                "recommendation_rate": round(recommend_rate, 2) if recommend_rate is not None else None
+                "recommendation_rate": round(float(result.recommend_rate), 2) if result.recommend_rate is not None else None
             }
         }
     except Exception as e:
@@ -178,27 +287,35 @@ def get_course_rating_summary(db: Session, course_id: Optional[int] = None, cour
 
 def get_top_rated_courses(db: Session, semester: Optional[str] = None, department: Optional[str] = None, min_reviews: int = 3, limit: int = 10) -> Dict:
     try:
+        # aggregate and rank on course_reviews alone, grouping by the narrow course_id key,
+        # then join only the top rows to courses for their labels
+        avg_rating = func.avg(CourseReview.rating)
+        agg = select(
+            CourseReview.course_id,
+            func.count().label('count'),
+            avg_rating.label('avg_rating')
+        )
+        if semester:
+            agg = agg.where(CourseReview.semester == semester)
+        if department:
+            agg = agg.where(CourseReview.course_id.in_(select(Course.id).where(Course.department == department)))
+        agg = (
+            agg.group_by(CourseReview.course_id)
+            .having(func.count() >= min_reviews)
+            .order_by(avg_rating.desc())
+            .limit(limit)
+            .subquery()
+        )
+
         query = db.query(
             Course.id.label('course_id'),
             Course.course_code,
             Course.name,
             Course.department,
             Course.semester,
-            func.count(CourseReview.id).label('count'),
-            func.avg(CourseReview.rating).label('avg_rating')
-        ).join(CourseReview, Course.id == CourseReview.course_id)
-
-        if semester:
-            query = query.filter(CourseReview.semester == semester)
-        if department:
-            query = query.filter(Course.department == department)
-
-        query = (
-            query.group_by(Course.id)
-            .having(func.count(CourseReview.id) >= min_reviews)
-            .order_by(func.avg(CourseReview.rating).desc())
-            .limit(limit)
-        )
+            agg.c.count,
+            agg.c.avg_rating
+        ).join(agg, Course.id == agg.c.course_id).order_by(agg.c.avg_rating.desc())
 
         rows = query.all()
         return {
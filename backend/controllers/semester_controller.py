@@ -1,15 +1,18 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+import threading
+from fastapi import APIRouter, HTTPException, Depends
+from typing import Dict, List, Optional
 from datetime import date
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import Session
 from ..tables.semester import Semester
+from ..api_models import RequestModel
+from ..services import cache
 from ..tables.database import get_db
 from ..tables.semester_info import SemesterInfo
 
 router = APIRouter()
 
-class SemesterCreate(BaseModel):
+class SemesterCreate(RequestModel):
     name: str
     start_date: date
     end_date: date
@@ -17,6 +20,8 @@ class SemesterCreate(BaseModel):
     term: str
 
 class SemesterResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     start_date: date
@@ -24,11 +29,8 @@ class SemesterResponse(BaseModel):
     year: int
     term: str
 
-    class Config:
-        orm_mode = True
-
 @router.post("/semesters/", response_model=SemesterResponse)
-def create_semester(semester: SemesterCreate, db: Session = get_db()):
+def create_semester(semester: SemesterCreate, db: Session = Depends(get_db)):
     db_semester = Semester(
         name=semester.name,
         start_date=semester.start_date,
@@ -42,30 +44,54 @@ def create_semester(semester: SemesterCreate, db: Session = get_db()):
     return db_semester
 
 @router.get("/semesters/", response_model=List[SemesterResponse])
-def get_semesters(db: Session = get_db()):
+def get_semesters(db: Session = Depends(get_db)):
     return db.query(Semester).all()
 
+# the current semester only changes with the date or a semester write: today's ordinal ->
+# the response (None when no semester covers today); only today's entry is kept
+_current_cache: Dict[int, Optional[SemesterResponse]] = {}
+_current_lock = threading.Lock()
+
+
+def _clear_current_semester() -> None:
+    with _current_lock:
+        _current_cache.clear()
+
+
+cache.register(_clear_current_semester, Semester)
+
+
 @router.get("/semesters/current", response_model=SemesterResponse)
-def get_current_semester(db: Session = get_db()):
+def get_current_semester(db: Session = Depends(get_db)):
     today = date.today()
-    current_semester = db.query(Semester)\
-        .filter(Semester.start_date <= today)\
-        .filter(Semester.end_date >= today)\
-        .first()
-    if not current_semester:
+    key = today.toordinal()
+    with _current_lock:
+        hit = key in _current_cache
+        current = _current_cache.get(key)
+    if not hit:
+        semester = db.query(Semester)\
+            .filter(Semester.start_date <= today)\
+            .filter(Semester.end_date >= today)\
+            .first()
+        # cache the validated response, not the ORM instance, which is tied to this session
+        current = SemesterResponse.model_validate(semester) if semester else None
+        with _current_lock:
+            _current_cache.clear()
+            _current_cache[key] = current
+    if current is None:
         raise HTTPException(status_code=404, detail="No current semester found")
-    return current_semester
+    return current
 
 @router.get("/semesters/{semester_id}", response_model=SemesterResponse)
-def get_semester(semester_id: int, db: Session = get_db()):
-    semester = db.query(Semester).filter(Semester.id == semester_id).first()
+def get_semester(semester_id: int, db: Session = Depends(get_db)):
+    semester = db.get(Semester, semester_id)
     if not semester:
         raise HTTPException(status_code=404, detail="Semester not found")
     return semester
 
 def create_semester(db: Session, semester: str, public: bool = False) -> dict:
     try:
-        existing = db.query(SemesterInfo).filter(SemesterInfo.semester == semester).first()
+        existing = db.query(db.query(SemesterInfo).filter(SemesterInfo.semester == semester).exists()).scalar()
         if existing:
             return {"success": False, "error": "Semester already exists"}
         s = SemesterInfo(semester=semester, public=public)
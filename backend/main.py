@@ -2,14 +2,14 @@
 from fastapi import FastAPI, Request, Response
 from starlette.middleware.sessions import SessionMiddleware
 import os
-from typing import Optional, List
+from typing import Any, Optional, List
 
 # Import Pydantic models and controllers
 from fastapi import Depends
 from sqlalchemy.orm import Session
 from api_models import (
     UserPydantic, SessionPydantic, CourseCreate,
-    CourseUpdate, CourseDelete, UserCoursePydantic,
+    CourseUpdate,
     CourseReviewCreate, CourseReviewUpdate
 )
 from controllers import (
@@ -24,6 +24,10 @@ from tables.course import Course
 # --- Initialize FastAPI App ---
 app = FastAPI()
 
+# declaring a response model lets FastAPI dump large listings straight to JSON bytes in
+# pydantic-core instead of jsonable_encoder + json.dumps
+JSONObject = dict[str, Any]
+
 # --- Add Middleware ---
 app.add_middleware(SessionMiddleware, secret_key="a_very_secret_key")
 
@@ -45,7 +49,7 @@ async def root():
 ## User Account Management ##
 @app.post('/api/user')
 async def add_user(user: UserPydantic):
-    return user_controller.create_user(user.dict())
+    return user_controller.create_user(user.model_dump())
 
 @app.delete('/api/user')
 async def delete_user(request: Request):
@@ -57,7 +61,7 @@ async def delete_user(request: Request):
 ## Session Management (Login/Logout) ##
 @app.post('/api/session')
 async def log_in(request: Request, credentials: SessionPydantic):
-    return session_controller.log_user_in(credentials.dict(), request.session)
+    return session_controller.log_user_in(credentials.model_dump(), request.session)
 
 @app.delete('/api/session')
 def log_out(request: Request):
@@ -65,14 +69,14 @@ def log_out(request: Request):
 
 ## Course Management ##
 @app.post('/api/courses')
-async def create_course(
+def create_course(
     course: CourseCreate,
     db: Session = Depends(get_db)
 ):
-    return course_controller.create_course(course.dict(), db)
+    return course_controller.create_course(course.model_dump(), db)
 
-@app.get('/api/courses')
-async def get_courses(
+@app.get('/api/courses', response_model=JSONObject)
+def get_courses(
     semester: Optional[str] = None,
     department: Optional[str] = None,
     db: Session = Depends(get_db)
@@ -80,7 +84,7 @@ async def get_courses(
     return course_controller.get_courses(semester, department, db)
 
 @app.get('/api/courses/{course_code}')
-async def get_course(
+def get_course(
     course_code: str,
     semester: str,
     db: Session = Depends(get_db)
@@ -88,41 +92,24 @@ async def get_course(
     return course_controller.get_course(course_code, semester, db)
 
 @app.put('/api/courses/{course_code}')
-async def update_course(
+def update_course(
     course_code: str,
     semester: str,
     updates: CourseUpdate,
     db: Session = Depends(get_db)
 ):
-    return course_controller.update_course(course_code, semester, updates.dict(exclude_unset=True), db)
+    return course_controller.update_course(course_code, semester, updates.model_dump(exclude_unset=True), db)
 
 @app.delete('/api/courses/{course_code}')
-async def delete_course(
+def delete_course(
     course_code: str,
     semester: str,
     db: Session = Depends(get_db)
 ):
     return course_controller.delete_course(course_code, semester, db)
-    return course_controller.get_courses()
-
-@app.get('/api/course/{course_id}')
-async def get_course_by_id(request: Request, course_id: int):
-    return course_controller.get_course_by_id(course_id, request.session)
-
-@app.put('/api/course/{course_id}')
-async def update_course(request: Request, course_id: int, credentials: UserCoursePydantic):
-    return course_controller.update_course(credentials.dict(), request.session)
-
-@app.delete('/api/course')
-async def delete_course_alt(request: Request, credentials: CourseDelete):
-    return course_controller.delete_course(credentials.dict(), request.session)
-
-@app.delete('/api/course/{course_id}')
-async def delete_course_by_id(request: Request, course_id: int):
-    return course_controller.delete_course_by_id(course_id, request.session)
 
 @app.get('/api/courses/{course_code}/prerequisites')
-async def get_prerequisites(
+def get_prerequisites(
     course_code: str,
     db: Session = Depends(get_db)
 ):
@@ -134,7 +121,7 @@ async def get_prerequisites(
     return course_controller.get_course_with_prerequisites(course.id, db)
 
 @app.post('/api/courses/{course_code}/prerequisites')
-async def add_prerequisite_endpoint(
+def add_prerequisite_endpoint(
     course_code: str,
     prerequisite_code: str,
     db: Session = Depends(get_db)
@@ -146,7 +133,7 @@ async def add_prerequisite_endpoint(
         return {"error": str(e)}, 400
 
 @app.get('/api/courses/{course_code}/required-by')
-async def get_courses_requiring(
+def get_courses_requiring(
     course_code: str,
     db: Session = Depends(get_db)
 ):
@@ -155,14 +142,14 @@ async def get_courses_requiring(
     return [{"course_code": c.course_code, "title": c.title} for c in courses]
 
 @app.get('/api/courses/{course_code}/corequisites')
-async def get_corequisites(course_code: str, db: Session = Depends(get_db)):
+def get_corequisites(course_code: str, db: Session = Depends(get_db)):
     course = db.query(Course).filter(Course.course_code == course_code).first()
     if not course:
         return {"error": "Course not found"}
     return course_controller.get_course_with_corequisites(course.id, db)
 
 @app.post('/api/courses/{course_code}/corequisites')
-async def add_corequisite_endpoint(
+def add_corequisite_endpoint(
     course_code: str,
     corequisite_code: str, #pass as query param ?corequisite_code=CSCI-XXXX
     db: Session = Depends(get_db)
@@ -173,12 +160,12 @@ async def add_corequisite_endpoint(
         return {"error": str(e)}
 
 @app.get('/api/courses/{course_code}/required-with')
-async def get_courses_requiring_coreq(course_code: str, db: Session = Depends(get_db)):
+def get_courses_requiring_coreq(course_code: str, db: Session = Depends(get_db)):
     courses = course_controller.get_courses_requiring_corequisite(course_code, db)
     return [{"course_code": c.course_code, "title": getattr(c, "title", None)} for c in courses]
 
-@app.get('/api/courses/search')
-async def search_courses(
+@app.get('/api/courses/search', response_model=JSONObject)
+def search_courses(
     query: Optional[str] = None,
     semester: Optional[str] = None,
     department: Optional[str] = None,
@@ -212,24 +199,24 @@ async def search_courses(
     )
 
 @app.get('/api/courses/departments')
-async def get_departments(semester: Optional[str] = None, db: Session = Depends(get_db)):
+def get_departments(semester: Optional[str] = None, db: Session = Depends(get_db)):
     return course_controller.get_departments(db, semester)
 
 @app.get('/api/courses/instructors')
-async def get_instructors(semester: Optional[str] = None, department: Optional[str] = None, db: Session = Depends(get_db)):
+def get_instructors(semester: Optional[str] = None, department: Optional[str] = None, db: Session = Depends(get_db)):
     return course_controller.get_instructors(db, semester, department)
 
 @app.get('/api/courses/levels')
-async def get_course_levels(department: Optional[str] = None, db: Session = Depends(get_db)):
+def get_course_levels(department: Optional[str] = None, db: Session = Depends(get_db)):
     return course_controller.get_course_levels(db, department)
 
 @app.get('/api/courses/department/{department}/level/{level}')
-async def get_courses_by_dept_level(department: str, level: str, semester: Optional[str] = None, db: Session = Depends(get_db)):
+def get_courses_by_dept_level(department: str, level: str, semester: Optional[str] = None, db: Session = Depends(get_db)):
     return course_controller.get_courses_by_department_level(db, department, level, semester)
 
 #conflict detection endpoints
-@app.post('/api/courses/check-conflicts')
-async def check_conflicts(course_ids: List[int], db: Session = Depends(get_db)):
+@app.post('/api/courses/check-conflicts', response_model=JSONObject)
+def check_conflicts(course_ids: List[int], db: Session = Depends(get_db)):
     """
     check scheduling conflicts by ids
     returns:
@@ -240,53 +227,54 @@ async def check_conflicts(course_ids: List[int], db: Session = Depends(get_db)):
     """
     return course_controller.check_schedule_conflicts(course_ids, db)
 
-@app.post('/api/courses/check-conflicts-by-code')
-async def check_conflicts_by_code(course_codes: List[str], semester: str, db: Session = Depends(get_db)):
+@app.post('/api/courses/check-conflicts-by-code', response_model=JSONObject)
+def check_conflicts_by_code(course_codes: List[str], semester: str, db: Session = Depends(get_db)):
     #check scheduling conflicts by course codes
     return course_controller.check_schedule_conflicts_by_codes(course_codes, semester, db)
 
-@app.post('/api/courses/find-non-conflicting')
-async def find_non_conflicting(enrolled_course_ids: List[int], semester: str, department: Optional[str] = None, level: Optional[str] = None, db: Session = Depends(get_db)):
+@app.post('/api/courses/find-non-conflicting', response_model=JSONObject)
+def find_non_conflicting(enrolled_course_ids: List[int], semester: str, department: Optional[str] = None, level: Optional[str] = None, include_reasons: bool = True, limit: Optional[int] = None, offset: int = 0, db: Session = Depends(get_db)):
     """
     find courses that dont conflict with currently enrolled courses
     returns:
         enrolled_courses
         non_conflicting_courses: courses without conflicts
-        conflicting_courses: courses with conflicts
+        conflicting_courses: courses with conflicts (with conflicts_with only when include_reasons is true)
+        has_more, next_offset: paging of non_conflicting_courses when a limit is given
     """
-    return course_controller.find_non_conflicting_courses(enrolled_course_ids, semester, db, department, level)
+    return course_controller.find_non_conflicting_courses(enrolled_course_ids, semester, db, department, level, include_reasons, limit, offset)
 
 #course review endpoints
 @app.post('/api/courses/{course_code}/reviews')
-async def add_course_review(course_code: str, review: CourseReviewCreate, semester: Optional[str] = None, db: Session = Depends(get_db)):
+def add_course_review(course_code: str, review: CourseReviewCreate, semester: Optional[str] = None, db: Session = Depends(get_db)):
     payload = review.model_dump(exclude_unset=True)
     payload['course_code'] = course_code
     if semester:
         payload['semester'] = semester
     return review_controller.create_review(payload, db)
 
-@app.get('/api/courses/{course_code}/reviews')
-async def list_course_reviews(course_code: str, semester: Optional[str] = None, limit: int = 50, offset: int = 0, db: Session = Depends(get_db)):
+@app.get('/api/courses/{course_code}/reviews', response_model=JSONObject)
+def list_course_reviews(course_code: str, semester: Optional[str] = None, limit: int = 50, offset: int = 0, db: Session = Depends(get_db)):
     return review_controller.list_reviews(db, course_code=course_code, semester=semester, limit=limit, offset=offset)
 
-@app.get('/api/reviews/{review_id}')
-async def get_single_review(review_id: int, db: Session = Depends(get_db)):
+@app.get('/api/reviews/{review_id}', response_model=JSONObject)
+def get_single_review(review_id: int, db: Session = Depends(get_db)):
     return review_controller.get_review(review_id, db)
 
 @app.put('/api/reviews/{review_id}')
-async def update_course_review(review_id: int, updates: CourseReviewUpdate, db: Session = Depends(get_db)):
+def update_course_review(review_id: int, updates: CourseReviewUpdate, db: Session = Depends(get_db)):
     return review_controller.update_review(review_id, updates.model_dump(exclude_unset=True), db)
 
 @app.delete('/api/reviews/{review_id}')
-async def delete_course_review(review_id: int, db: Session = Depends(get_db)):
+def delete_course_review(review_id: int, db: Session = Depends(get_db)):
     return review_controller.delete_review(review_id, db)
 
 @app.get('/api/courses/{course_code}/reviews/summary')
-async def get_course_review_summary(course_code: str, semester: Optional[str] = None, db: Session = Depends(get_db)):
+def get_course_review_summary(course_code: str, semester: Optional[str] = None, db: Session = Depends(get_db)):
     return review_controller.get_course_rating_summary(db, course_code=course_code, semester=semester)
 
 @app.get('/api/courses/top-rated')
-async def get_top_rated_courses(semester: Optional[str] = None, department: Optional[str] = None, min_reviews: int = 3, limit: int = 10, db: Session = Depends(get_db)):
+def get_top_rated_courses(semester: Optional[str] = None, department: Optional[str] = None, min_reviews: int = 3, limit: int = 10, db: Session = Depends(get_db)):
     return review_controller.get_top_rated_courses(db, semester=semester, department=department, min_reviews=min_reviews, limit=limit)
 
 
@@ -0,0 +1,19 @@
+"""Add composite (course_code, semester) index to courses
+
+Revision ID: add_course_code_semester_index
+Revises: add_course_offering_details
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+
+def upgrade():
+    # course_code alone is no longer unique: the same code is offered in many semesters
+    op.drop_constraint('courses_course_code_key', 'courses', type_='unique')
+    op.create_index('ix_course_code_semester', 'courses', ['course_code', 'semester'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_course_code_semester', table_name='courses')
+    op.create_unique_constraint('courses_course_code_key', 'courses', ['course_code'])
@@ -0,0 +1,29 @@
+"""Add days_mask bitmask column to courses
+
+Revision ID: add_course_days_mask
+Revises: shrink_course_review_scores
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    # bit per meeting day (M=1, T=2, W=4, R=8, F=16, S=32, U=64); matches tables.course.DAY_BITS
+    op.add_column('courses', sa.Column('days_mask', sa.SmallInteger, nullable=True))
+    op.execute("""
+        UPDATE courses SET days_mask =
+              (CASE WHEN upper(days_of_week) LIKE '%M%' THEN 1 ELSE 0 END)
+            + (CASE WHEN upper(days_of_week) LIKE '%T%' THEN 2 ELSE 0 END)
+            + (CASE WHEN upper(days_of_week) LIKE '%W%' THEN 4 ELSE 0 END)
+            + (CASE WHEN upper(days_of_week) LIKE '%R%' THEN 8 ELSE 0 END)
+            + (CASE WHEN upper(days_of_week) LIKE '%F%' THEN 16 ELSE 0 END)
+            + (CASE WHEN upper(days_of_week) LIKE '%S%' THEN 32 ELSE 0 END)
+            + (CASE WHEN upper(days_of_week) LIKE '%U%' THEN 64 ELSE 0 END)
+        WHERE days_of_week IS NOT NULL AND days_of_week <> ''
+    """)
+
+
+def downgrade():
+    op.drop_column('courses', 'days_mask')
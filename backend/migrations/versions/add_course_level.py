@@ -0,0 +1,25 @@
+"""Add indexed level column to courses
+
+Revision ID: add_course_level
+Revises: add_course_days_mask
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    # 1000/2000/... from the first digit after the department prefix, e.g. CSCI-2200 -> 2000
+    op.add_column('courses', sa.Column('level', sa.SmallInteger, nullable=True))
+    op.execute("""
+        UPDATE courses
+        SET level = CAST(substring(course_code from '^[^-]*-([0-9])') AS SMALLINT) * 1000
+        WHERE course_code ~ '^[^-]*-[0-9]'
+    """)
+    op.create_index('ix_courses_level', 'courses', ['level'])
+
+
+def downgrade():
+    op.drop_index('ix_courses_level', table_name='courses')
+    op.drop_column('courses', 'level')
@@ -0,0 +1,18 @@
+"""Add (semester, department) and (semester, instructor) indexes to courses
+
+Revision ID: add_course_semester_indexes
+Revises: add_course_level
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+
+def upgrade():
+    op.create_index('ix_course_semester_department', 'courses', ['semester', 'department'])
+    op.create_index('ix_course_semester_instructor', 'courses', ['semester', 'instructor'])
+
+
+def downgrade():
+    op.drop_index('ix_course_semester_instructor', table_name='courses')
+    op.drop_index('ix_course_semester_department', table_name='courses')
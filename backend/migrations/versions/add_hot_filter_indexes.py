@@ -0,0 +1,30 @@
+"""Add composite indexes for course review listings and a unique preferences index
+
+Revision ID: add_hot_filter_indexes
+Revises: add_reservation_offering_status_index
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    # list_reviews pages by ORDER BY created_at DESC LIMIT within a course or a semester
+    op.create_index(
+        'ix_course_review_course_created',
+        'course_reviews',
+        ['course_id', sa.text('created_at DESC')],
+    )
+    op.create_index(
+        'ix_course_review_semester_created',
+        'course_reviews',
+        ['semester', sa.text('created_at DESC')],
+    )
+    op.create_index('ix_student_preferences_user', 'student_preferences', ['user_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_student_preferences_user', table_name='student_preferences')
+    op.drop_index('ix_course_review_semester_created', table_name='course_reviews')
+    op.drop_index('ix_course_review_course_created', table_name='course_reviews')
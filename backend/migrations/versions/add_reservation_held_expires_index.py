@@ -0,0 +1,23 @@
+"""Add partial index on reservations.expires_at for held rows
+
+Revision ID: add_reservation_held_expires_index
+Revises: add_hot_filter_indexes
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    # the periodic expiry sweep only ever looks at held reservations
+    op.create_index(
+        'ix_reservation_held_expires',
+        'reservations',
+        ['expires_at'],
+        postgresql_where=sa.text("status = 'held'"),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_reservation_held_expires', table_name='reservations')
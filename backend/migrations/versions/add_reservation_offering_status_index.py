@@ -0,0 +1,20 @@
+"""Add (offering_id, status, expires_at) index to reservations
+
+Revision ID: add_reservation_offering_status_index
+Revises: add_course_semester_indexes
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+
+def upgrade():
+    op.create_index(
+        'ix_reservation_offering_status_expires',
+        'reservations',
+        ['offering_id', 'status', 'expires_at'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_reservation_offering_status_expires', table_name='reservations')
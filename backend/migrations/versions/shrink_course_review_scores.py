@@ -0,0 +1,20 @@
+"""Store course review scores as SMALLINT
+
+Revision ID: shrink_course_review_scores
+Revises: add_course_code_semester_index
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    # rating/difficulty are 1-5 and workload_hours is a weekly figure; two bytes is plenty
+    for column, nullable in (('rating', False), ('difficulty', True), ('workload_hours', True)):
+        op.alter_column('course_reviews', column, type_=sa.SmallInteger(), existing_type=sa.Integer(), existing_nullable=nullable)
+
+
+def downgrade():
+    for column, nullable in (('rating', False), ('difficulty', True), ('workload_hours', True)):
+        op.alter_column('course_reviews', column, type_=sa.Integer(), existing_type=sa.SmallInteger(), existing_nullable=nullable)
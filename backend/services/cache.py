@@ -0,0 +1,67 @@
+"""Invalidation for the process-wide caches kept by controllers and services.
+
+A cache registers a function that clears it together with the mapped classes its contents
+are derived from. Writes to those classes are collected per session, from flushed
+instances and from ORM-enabled bulk INSERT/UPDATE/DELETE statements, and the matching
+caches are cleared once the session commits. Rolled-back writes clear nothing.
+"""
+from itertools import chain
+from typing import Callable, Dict, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_PENDING_KEY = 'cache_invalidation_pending'
+
+# clear function -> mapped classes whose writes invalidate it
+_registry: Dict[Callable[[], None], tuple] = {}
+
+
+def register(clear: Callable[[], None], *models: type) -> None:
+    """clear() is called after any commit that wrote one of models"""
+    _registry[clear] = _registry.get(clear, ()) + models
+
+
+def invalidate(touched: Set[type]) -> None:
+    """clear every registered cache derived from one of the touched classes"""
+    for clear, models in list(_registry.items()):
+        if any(issubclass(cls, model) for cls in touched for model in models):
+            clear()
+
+
+def clear_all() -> int:
+    """clear every registered cache (admin reset); returns how many were cleared"""
+    clears = list(_registry)
+    for clear in clears:
+        clear()
+    return len(clears)
+
+
+def _pending(session: Session) -> Set[type]:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed(session, flush_context):
+    _pending(session).update(type(obj) for obj in chain(session.new, session.dirty, session.deleted))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk(orm_execute_state):
+    # UPDATE ... RETURNING, INSERT ... ON CONFLICT and friends never pass through a flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _pending(orm_execute_state.session).update(m.class_ for m in orm_execute_state.all_mappers)
+
+
+@event.listens_for(Session, 'after_commit')
+def _clear_committed(session):
+    touched = session.info.pop(_PENDING_KEY, None)
+    if touched:
+        invalidate(touched)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _drop_rolled_back(session, previous_transaction):
+    # only the outermost rollback discards everything written in the transaction
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
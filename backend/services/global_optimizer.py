@@ -1,4 +1,5 @@
-from typing import List, Dict, Optional, Set
+from collections import defaultdict
+from typing import Callable, List, Dict, Optional, Set
 from sqlalchemy.orm import Session
 from datetime import datetime
 
@@ -33,6 +34,24 @@ def _next_sem_label(label: str) -> str:
     return f"{next_term} {next_year}"
 
 
+def dfs_match(start: str, targets: Set[str], adj: Dict[str, Set[str]], gate: Callable[[str], bool] = lambda n: True) -> bool:
+    """True as soon as a node in targets is reachable from start along adj.
+
+    Nodes failing gate are not expanded further. Iterative, and stops at the first hit
+    instead of ordering the whole graph.
+    """
+    stack = [start]
+    visited = {start}
+    while stack:
+        for nxt in adj.get(stack.pop(), ()):
+            if nxt in targets:
+                return True
+            if nxt not in visited and gate(nxt):
+                visited.add(nxt)
+                stack.append(nxt)
+    return False
+
+
 def build_prereq_map(db: Session) -> Dict[str, Set[str]]:
     courses = db.query(Course).all()
     id_to_code = {c.id: c.course_code for c in courses}
@@ -90,24 +109,35 @@ def optimize_pathway_exact(
     for i in range(1, max_terms):
         terms.append(_next_sem_label(terms[-1]))
 
-    # availability: course x term -> bool if any offering exists and (has space or allow_overfull)
-    availability = {code: [False] * len(terms) for code in remaining_codes}
-    for ti, sem_label in enumerate(terms):
+    # every offering of the remaining courses in one query, bucketed by (course_id, term, year);
+    # the per-term loops below then read buckets instead of querying per course and term
+    remaining_ids = [code_to_course[code].id for code in remaining_codes]
+    offerings = defaultdict(list)
+    for off in db.query(CourseOffering).filter(CourseOffering.course_id.in_(remaining_ids)).order_by(CourseOffering.id):
+        offerings[(off.course_id, off.term, off.year)].append(off)
+
+    term_keys = []
+    for sem_label in terms:
         try:
             term_name, year_s = sem_label.split()
             year = int(year_s)
         except Exception:
             term_name = sem_label
             year = None
+        term_keys.append((term_name, year))
+
+    def term_offerings(course: Course, t: int) -> List[CourseOffering]:
+        # offerings for that exact year first, then ones listed for the term in any year
+        term_name, year = term_keys[t]
+        cand = list(offerings.get((course.id, term_name, year), ())) if year is not None else []
+        cand.extend(offerings.get((course.id, term_name, None), ()))
+        return cand
+
+    # availability: course x term -> bool if any offering exists and (has space or allow_overfull)
+    availability = {code: [False] * len(terms) for code in remaining_codes}
+    for ti in range(len(terms)):
         for code in remaining_codes:
-            course = code_to_course.get(code)
-            if not course:
-                continue
-            q = db.query(CourseOffering).filter(CourseOffering.course_id == course.id)
-            cand = []
-            if year is not None:
-                cand.extend(q.filter((CourseOffering.year == year) & (CourseOffering.term == term_name)).all())
-            cand.extend(q.filter((CourseOffering.year == None) & (CourseOffering.term == term_name)).all())
+            cand = term_offerings(code_to_course[code], ti)
             if not cand:
                 availability[code][ti] = False
             else:
@@ -123,10 +153,23 @@ def optimize_pathway_exact(
                 if ok or allow_overfull:
                     availability[code][ti] = True
 
+    # only prerequisites inside the pathway are modeled; one of them done or taken earlier suffices
+    pathway_prereqs = {code: {p for p in prereq_map.get(code, set()) if p in code_to_course} for code in remaining_codes}
+    offered = {code for code in remaining_codes if any(availability[code])}
+    # a course is schedulable if a chain of offered prerequisites ends at a completed course or
+    # at one with no prerequisites; courses that cannot get there get no variables at all
+    roots = set(completed) | {code for code in offered if not pathway_prereqs[code]}
+    schedulable = {
+        code for code in offered
+        if code in roots or dfs_match(code, roots, pathway_prereqs, gate=offered.__contains__)
+    }
+
     # CP-SAT model
     model = cp_model.CpModel()
     x = {}
     for i, code in enumerate(remaining_codes):
+        if code not in schedulable:
+            continue
         for t in range(len(terms)):
             if availability[code][t]:
                 x[(code, t)] = model.NewBoolVar(f"x_{code}_{t}")
@@ -135,16 +178,17 @@ def optimize_pathway_exact(
                 pass
 
     # each course at most once
-    for code in remaining_codes:
-        vars_for_code = [v for (c, t), v in x.items() if c == code]
-        if vars_for_code:
-            model.Add(sum(vars_for_code) <= 1)
+    vars_by_code = defaultdict(list)
+    for (c, t), v in x.items():
+        vars_by_code[c].append(v)
+    for vars_for_code in vars_by_code.values():
+        model.Add(sum(vars_for_code) <= 1)
 
     # prerequisites: for c with prereqs P, x_c_t <= sum_{s<t} x_p_s
     for code in remaining_codes:
-        prereqs = prereq_map.get(code, set())
-        prereqs = [p for p in prereqs if p in remaining_codes or p in code_to_course]
-        if not prereqs:
+        prereqs = pathway_prereqs[code]
+        # a completed prerequisite has no variable but already satisfies the constraint
+        if not prereqs or not prereqs.isdisjoint(completed):
             continue
         for t in range(len(terms)):
             var_c_t = x.get((code, t))
@@ -204,20 +248,8 @@ def optimize_pathway_exact(
             if var and solver.Value(var) == 1:
                 c = code_to_course.get(code)
                 # pick an offering for this term using simple preference logic
-                offering = None
-                try:
-                    term_name, year_s = sem_label.split()
-                    year = int(year_s)
-                except Exception:
-                    term_name = sem_label
-                    year = None
-                q = db.query(CourseOffering).filter(CourseOffering.course_id == c.id)
-                candidates = []
-                if year is not None:
-                    candidates.extend(q.filter((CourseOffering.year == year) & (CourseOffering.term == term_name)).all())
-                candidates.extend(q.filter((CourseOffering.year == None) & (CourseOffering.term == term_name)).all())
-                if candidates:
-                    offering = candidates[0]
+                candidates = term_offerings(c, t)
+                offering = candidates[0] if candidates else None
 
                 offering_info = None
                 if offering:
@@ -1,13 +1,17 @@
 from typing import List, Dict, Set, Optional
-from sqlalchemy.orm import Session
+import threading
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased
 from datetime import datetime
 
-from ..tables.pathway import Pathway
+from ..tables.pathway import Pathway, PathwayRequirement
 from ..tables.course import Course
 from ..tables.course_prerequisite import CoursePrerequisite
 from ..tables.semester import Semester as SemesterModel
 from ..tables.course_offering import CourseOffering
 from ..tables.student_preferences import StudentPreferences
+from . import cache
 
 
 def _next_semester_label(current_label: str) -> str:
@@ -42,49 +46,97 @@ def _next_semester_label(current_label: str) -> str:
     return f"{next_term} {next_year}"
 
 
+# prerequisite edges and pathway course codes are read on every optimize call but change only
+# when the catalog is edited; cached as plain data (never ORM rows, which belong to one session),
+# cleared after any commit that writes their source tables and capped at 10 minutes for other
+# workers' writes
+_prereq_cache = TTLCache(maxsize=1, ttl=600)
+_pathway_codes_cache = TTLCache(maxsize=64, ttl=600)
+_catalog_lock = threading.Lock()
+
+
+def _clear_prereq_cache() -> None:
+    with _catalog_lock:
+        _prereq_cache.clear()
+
+
+def _clear_pathway_codes_cache() -> None:
+    with _catalog_lock:
+        _pathway_codes_cache.clear()
+
+
+cache.register(_clear_prereq_cache, Course, CoursePrerequisite)
+cache.register(_clear_pathway_codes_cache, Course, Pathway, PathwayRequirement)
+
+
 def build_prereq_map(db: Session) -> Dict[str, Set[str]]:
-    """Return mapping course_code -> set of prerequisite course_codes."""
-    # Map course id -> course_code
-    courses = db.query(Course).all()
-    id_to_code = {c.id: c.course_code for c in courses}
-
-    prereq_map: Dict[str, Set[str]] = {c.course_code: set() for c in courses}
-    rels = db.query(CoursePrerequisite).all()
-    for r in rels:
-        course_code = id_to_code.get(r.course_id)
-        prereq_code = id_to_code.get(r.prerequisite_id)
-        if course_code and prereq_code:
-            prereq_map.setdefault(course_code, set()).add(prereq_code)
+    """Return mapping course_code -> set of prerequisite course_codes.
 
+    The result is shared between requests; treat it as read-only.
+    """
+    with _catalog_lock:
+        cached = _prereq_cache.get('prereq_map')
+    if cached is not None:
+        return cached
+
+    prereq_map: Dict[str, Set[str]] = {
+        code: set() for code in db.execute(select(Course.course_code)).scalars()
+    }
+    # resolve both ends to codes in the database instead of mapping ids in python
+    prereq = aliased(Course)
+    edges = db.execute(
+        select(Course.course_code, prereq.course_code)
+        .join(CoursePrerequisite, CoursePrerequisite.course_id == Course.id)
+        .join(prereq, prereq.id == CoursePrerequisite.prerequisite_id)
+    )
+    for course_code, prereq_code in edges:
+        prereq_map.setdefault(course_code, set()).add(prereq_code)
+
+    with _catalog_lock:
+        _prereq_cache['prereq_map'] = prereq_map
     return prereq_map
 
 
-def gather_pathway_courses(db: Session, pathway_id: Optional[int] = None, pathway_code: Optional[str] = None) -> List[Course]:
+def _pathway_course_codes(db: Session, pathway_id: Optional[int], pathway_code: Optional[str]) -> frozenset:
+    key = (pathway_id, pathway_code if pathway_id is None else None)
+    with _catalog_lock:
+        cached = _pathway_codes_cache.get(key)
+    if cached is not None:
+        return cached
+
     if pathway_id is not None:
-        pathway = db.query(Pathway).filter(Pathway.id == pathway_id).first()
-    elif pathway_code is not None:
-        pathway = db.query(Pathway).filter(Pathway.code == pathway_code).first()
+        pathway = db.get(Pathway, pathway_id)
     else:
-        raise ValueError("Either pathway_id or pathway_code must be provided")
-
-    if not pathway:
-        return []
+        pathway = db.query(Pathway).filter(Pathway.code == pathway_code).first()
 
     course_set = set()
-    # include pathway.courses and requirement courses if present
-    if hasattr(pathway, 'courses') and pathway.courses:
-        for c in pathway.courses:
-            course_set.add(c.course_code)
+    if pathway:
+        # include pathway.courses and requirement courses if present
+        if hasattr(pathway, 'courses') and pathway.courses:
+            for c in pathway.courses:
+                course_set.add(c.course_code)
+
+        if hasattr(pathway, 'requirements') and pathway.requirements:
+            for req in pathway.requirements:
+                if hasattr(req, 'courses') and req.courses:
+                    for c in req.courses:
+                        course_set.add(c.course_code)
+
+    codes = frozenset(course_set)
+    with _catalog_lock:
+        _pathway_codes_cache[key] = codes
+    return codes
 
-    if hasattr(pathway, 'requirements') and pathway.requirements:
-        for req in pathway.requirements:
-            if hasattr(req, 'courses') and req.courses:
-                for c in req.courses:
-                    course_set.add(c.course_code)
 
+def gather_pathway_courses(db: Session, pathway_id: Optional[int] = None, pathway_code: Optional[str] = None) -> List[Course]:
+    if pathway_id is None and pathway_code is None:
+        raise ValueError("Either pathway_id or pathway_code must be provided")
+
+    course_set = _pathway_course_codes(db, pathway_id, pathway_code)
     if not course_set:
         return []
 
+    # the courses themselves are loaded into the caller's session
     courses = db.query(Course).filter(Course.course_code.in_(list(course_set))).all()
     return courses
 
@@ -182,20 +234,23 @@ def optimize_pathway(
         except Exception:
             return None
 
-    def times_conflict(a: CourseOffering, b: CourseOffering) -> bool:
-        days_a = parse_days(a.days)
-        days_b = parse_days(b.days)
-        if not days_a or not days_b:
-            return False
-        if days_a.isdisjoint(days_b):
-            return False
-        a_s = parse_time(a.start_time)
-        a_e = parse_time(a.end_time)
-        b_s = parse_time(b.start_time)
-        b_e = parse_time(b.end_time)
-        if a_s is None or a_e is None or b_s is None or b_e is None:
-            return False
-        return not (a_e <= b_s or b_e <= a_s)
+    # each offering's week as an int with one bit per minute it meets, so two offerings
+    # conflict iff their masks share a bit and a whole schedule is just the OR of its masks
+    day_offset = {d: i * 24 * 60 for i, d in enumerate(('M', 'T', 'W', 'R', 'F', 'S', 'U'))}
+    meeting_masks: Dict[int, int] = {}
+
+    def meeting_mask(off: CourseOffering) -> int:
+        mask = meeting_masks.get(off.id)
+        if mask is None:
+            mask = 0
+            start = parse_time(off.start_time)
+            end = parse_time(off.end_time)
+            if start is not None and end is not None and end > start:
+                block = ((1 << (end - start)) - 1) << start
+                for d in parse_days(off.days):
+                    mask |= block << day_offset[d]
+            meeting_masks[off.id] = mask
+        return mask
 
     # Load student preferences if provided
     preferences = None
@@ -327,8 +382,12 @@ def optimize_pathway(
                 best_set: List[tuple] = []
                 best_credit = 0
                 n = len(candidates)
+                # credits still obtainable from candidates[j:]; a branch that cannot beat best_credit is cut
+                suffix_credit = [0] * (n + 1)
+                for j in range(n - 1, -1, -1):
+                    suffix_credit[j] = suffix_credit[j + 1] + candidates[j][2]
 
-                def dfs(idx: int, cur: List[tuple], cur_credit: int):
+                def dfs(idx: int, cur: List[tuple], cur_credit: int, busy: int):
                     nonlocal best_set, best_credit
                     if cur_credit > best_credit:
                         best_set = cur.copy()
@@ -336,21 +395,19 @@ def optimize_pathway(
                     if idx >= n:
                         return
                     for j in range(idx, n):
+                        if cur_credit + suffix_credit[j] <= best_credit:
+                            break
                         code_j, off_j, cred_j = candidates[j]
                         if cur_credit + cred_j > eff_max_credits:
                             continue
-                        conflict = False
-                        for (_, off_k, _) in cur:
-                            if times_conflict(off_j, off_k):
-                                conflict = True
-                                break
-                        if conflict:
+                        mask_j = meeting_mask(off_j)
+                        if busy & mask_j:
                             continue
                         cur.append((code_j, off_j, cred_j))
-                        dfs(j + 1, cur, cur_credit + cred_j)
+                        dfs(j + 1, cur, cur_credit + cred_j, busy | mask_j)
                         cur.pop()
 
-                dfs(0, [], 0)
+                dfs(0, [], 0, 0)
                 selected = best_set
 
             semester_courses = []
@@ -469,7 +526,11 @@ def optimize_pathway(
             best_set = []
             best_credit = 0
             n = len(candidates)
-            def dfs(idx: int, cur: List[tuple], cur_credit: int):
+            # credits still obtainable from candidates[j:]; a branch that cannot beat best_credit is cut
+            suffix_credit = [0] * (n + 1)
+            for j in range(n - 1, -1, -1):
+                suffix_credit[j] = suffix_credit[j + 1] + candidates[j][2]
+            def dfs(idx: int, cur: List[tuple], cur_credit: int, busy: int):
                 nonlocal best_set, best_credit
                 if cur_credit > best_credit and cur_credit <= target_credits:
                     best_set = cur.copy()
@@ -477,20 +538,18 @@ def optimize_pathway(
                 if idx >= n:
                     return
                 for j in range(idx, n):
+                    if cur_credit + suffix_credit[j] <= best_credit:
+                        break
                     code_j, off_j, cred_j = candidates[j]
                     if cur_credit + cred_j > target_credits:
                         continue
-                    conflict = False
-                    for (_, off_k, _) in cur:
-                        if times_conflict(off_j, off_k):
-                            conflict = True
-                            break
-                    if conflict:
+                    mask_j = meeting_mask(off_j)
+                    if busy & mask_j:
                         continue
                     cur.append((code_j, off_j, cred_j))
-                    dfs(j + 1, cur, cur_credit + cred_j)
+                    dfs(j + 1, cur, cur_credit + cred_j, busy | mask_j)
                     cur.pop()
-            dfs(0, [], 0)
+            dfs(0, [], 0, 0)
             selected = best_set
         semester_courses = []
         credits = 0
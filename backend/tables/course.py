@@ -1,12 +1,44 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Time
+from sqlalchemy import Column, Integer, SmallInteger, String, Text, Boolean, ForeignKey, Time, Index, event
+from sqlalchemy.orm import relationship, validates
 from .database import Base
 from datetime import time as dt_time
+from functools import lru_cache
+
+# one bit per meeting day so day overlap is a single bitwise AND (in python or in SQL)
+DAY_BITS = {'M': 1, 'T': 2, 'W': 4, 'R': 8, 'F': 16, 'S': 32, 'U': 64}
+
+@lru_cache(maxsize=256)
+def days_to_mask(days):
+    """turn a day string like "MWR" into its DAY_BITS mask; None when there are no days"""
+    if not days:
+        return None
+    mask = 0
+    for day in days.upper():
+        mask |= DAY_BITS.get(day, 0)
+    return mask
+
+def course_code_to_level(code):
+    """level of a code like "CSCI-2200" -> 2000; None when the number part does not start with a digit"""
+    if not code or '-' not in code:
+        return None
+    number_part = code.split('-')[1]
+    if number_part and number_part[0].isdigit():
+        return int(number_part[0]) * 1000
+    return None
 
 class Course(Base):
     __tablename__ = 'courses'
+    __table_args__ = (
+        # a course code is offered once per semester; every controller lookup filters on both
+        Index('ix_course_code_semester', 'course_code', 'semester', unique=True),
+        # listing filters: get_courses/search by department, get_instructors, all scoped to a semester
+        Index('ix_course_semester_department', 'semester', 'department'),
+        Index('ix_course_semester_instructor', 'semester', 'instructor'),
+    )
 
     id = Column(Integer, primary_key=True)
-    course_code = Column(String(10), unique=True, nullable=False)  # e.g., "CSCI-1200"
+    course_code = Column(String(10), nullable=False)  # e.g., "CSCI-1200"
+    level = Column(SmallInteger, nullable=True, index=True)  # e.g., 1000; derived from course_code by set_level
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     credits = Column(Integer, nullable=False)
@@ -16,12 +48,46 @@ class Course(Base):
     capacity = Column(Integer, nullable=True)
     instructor = Column(String(100), nullable=True)
     days_of_week = Column(String(10), nullable=True) #formats like "MWR", "TF", "MTWRF", etc
+    days_mask = Column(SmallInteger, nullable=True) #DAY_BITS of days_of_week, kept in sync by set_days_mask
     start_time = Column(Time, nullable=True) #formats like 10:00:00
     end_time = Column(Time, nullable=True) #formats like 11:50:00
     location = Column(String(100), nullable=True) #formats like "DCC 308"
 
+    # courses reachable through the association tables; `prerequisites` is already the free-text column
+    prerequisite_courses = relationship(
+        "Course",
+        secondary="course_prerequisite",
+        primaryjoin="Course.id == CoursePrerequisite.course_id",
+        secondaryjoin="Course.id == CoursePrerequisite.prerequisite_id",
+        viewonly=True,
+    )
+    corequisite_courses = relationship(
+        "Course",
+        secondary="course_corequisite",
+        primaryjoin="Course.id == CourseCorequisite.course_id",
+        secondaryjoin="Course.id == CourseCorequisite.corequisite_id",
+        viewonly=True,
+    )
+
+    @validates('course_code')
+    def set_level(self, key, code):
+        self.level = course_code_to_level(code)
+        return code
+
+    @validates('days_of_week')
+    def set_days_mask(self, key, days):
+        self.days_mask = days_to_mask(days)
+        return days
+
     def to_dict(self):
         """Convert course object to dictionary"""
+        #built once per loaded state; _drop_dict_cache clears it on any write, expire or refresh
+        cached = self.__dict__.get('_dict_cache')
+        if cached is None:
+            cached = self._dict_cache = self._build_dict()
+        return dict(cached)
+
+    def _build_dict(self):
         return {
             'id': self.id,
             'course_code': self.course_code,
@@ -37,4 +103,13 @@ class Course(Base):
             'start_time': self.start_time.strftime('%H:%M:%S') if self.start_time else None,
             'end_time': self.end_time.strftime('%H:%M:%S') if self.end_time else None,
             'location': self.location
-        }
\ No newline at end of file
+        }
+
+
+def _drop_dict_cache(target, *args):
+    target.__dict__.pop('_dict_cache', None)
+
+for _column in Course.__table__.columns:
+    event.listen(getattr(Course, _column.key), 'set', _drop_dict_cache)
+event.listen(Course, 'expire', _drop_dict_cache)
+event.listen(Course, 'refresh', _drop_dict_cache)
@@ -9,7 +9,7 @@ class CoursePrerequisite(Base):
     course_id = Column(Integer, ForeignKey('courses.id'), nullable=False)
     prerequisite_id = Column(Integer, ForeignKey('courses.id'), nullable=False)
 
-    course = relationship("Course", foreign_keys=[course_id], backref="prerequisites")
+    course = relationship("Course", foreign_keys=[course_id], backref="prerequisite_links")
     prerequisite = relationship("Course", foreign_keys=[prerequisite_id])
 
     __table_args__ = (
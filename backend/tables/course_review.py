@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, func
+from sqlalchemy import Column, Integer, SmallInteger, String, Text, ForeignKey, DateTime, Boolean, Index, func, text
 from sqlalchemy.orm import relationship
 
 from .database import Base
@@ -6,15 +6,21 @@ from .database import Base
 
 class CourseReview(Base):
     __tablename__ = 'course_reviews'
+    __table_args__ = (
+        # list_reviews filters on one of these and pages by ORDER BY created_at DESC LIMIT
+        Index('ix_course_review_course_created', 'course_id', text('created_at DESC')),
+        Index('ix_course_review_semester_created', 'semester', text('created_at DESC')),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     course_id = Column(Integer, ForeignKey('courses.id'), nullable=False, index=True)
     semester = Column(String(20), nullable=True)
     user_identifier = Column(String(255), nullable=True)
     user_name = Column(String(255), nullable=True)
-    rating = Column(Integer, nullable=False)
-    difficulty = Column(Integer, nullable=True)
-    workload_hours = Column(Integer, nullable=True)
+    # bounded scores (see ReviewScore/WorkloadHours in api_models) fit in two bytes
+    rating = Column(SmallInteger, nullable=False)
+    difficulty = Column(SmallInteger, nullable=True)
+    workload_hours = Column(SmallInteger, nullable=True)
     would_recommend = Column(Boolean, nullable=True)
     comment = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -3,3 +3,12 @@ from sqlalchemy.ext.declarative import declarative_base
 Base = declarative_base()
 
 
+def get_db():
+    """FastAPI dependency: one session per request, always returned to the pool"""
+    # imported here so that importing Base for the models does not build the engine
+    from .database_session import SessionLocal
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
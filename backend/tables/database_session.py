@@ -9,7 +9,18 @@ DB_HOST = os.environ.get('DB_HOST', 'localhost')
 DB_PORT = os.environ.get('DB_PORT', None)
 DB_PASS = os.environ.get('DB_PASS', None)
 
-engine = create_engine(f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}/{DB_NAME}")
+# pooled connections sized for the FastAPI threadpool; pre_ping drops connections postgres
+# closed while idle and recycle retires them before server-side timeouts.
+# query_cache_size leaves room for every statement shape the controllers build.
+engine = create_engine(
+    f"postgresql+psycopg://{DB_USER}:{DB_PASS}@{DB_HOST}/{DB_NAME}",
+    pool_size=20,
+    max_overflow=20,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    query_cache_size=1200,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 if __name__=="__main__":
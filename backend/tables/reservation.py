@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -6,6 +6,12 @@ from .database import Base
 
 class Reservation(Base):
     __tablename__ = 'reservations'
+    __table_args__ = (
+        # seat checks count active holds per offering: offering_id = ? AND status = 'held' AND expires_at > now
+        Index('ix_reservation_offering_status_expires', 'offering_id', 'status', 'expires_at'),
+        # the expiry sweep: status = 'held' AND expires_at <= now, across all offerings
+        Index('ix_reservation_held_expires', 'expires_at', postgresql_where=text("status = 'held'")),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     offering_id = Column(Integer, ForeignKey('course_offerings.id'), nullable=False)
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Boolean, Text, ForeignKey, Time
+from sqlalchemy import Column, Integer, String, Boolean, Text, ForeignKey, Time, Index
 from sqlalchemy.orm import relationship
 from .database import Base
 
 
 class StudentPreferences(Base):
     __tablename__ = 'student_preferences'
+    __table_args__ = (
+        # one row per user; get/set_preferences look it up by user_id
+        Index('ix_student_preferences_user', 'user_id', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, nullable=True)  # optional link to users table if available
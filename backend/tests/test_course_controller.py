@@ -0,0 +1,22 @@
+import ast
+from pathlib import Path
+
+CONTROLLER = Path(__file__).resolve().parent.parent / 'controllers' / 'course_controller.py'
+
+
+def top_level_functions(name):
+    # parsed rather than imported so the check doesn't need a database driver
+    tree = ast.parse(CONTROLLER.read_text())
+    return [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == name]
+
+
+def test_update_course_is_the_db_version():
+    defs = top_level_functions('update_course')
+    assert len(defs) == 1
+    assert [arg.arg for arg in defs[0].args.args] == ['course_code', 'semester', 'updates', 'db']
+
+
+def test_delete_course_is_the_db_version():
+    defs = top_level_functions('delete_course')
+    assert len(defs) == 1
+    assert [arg.arg for arg in defs[0].args.args] == ['course_code', 'semester', 'db']